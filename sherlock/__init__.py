@@ -1,13 +1,24 @@
 import sys
 
-from sherlock.core import Sherlock
 from sherlock.exceptions import SherlockFatalError
 
 
 def run_cli():
+    # imported here so light modules like sherlock.client don't import Robot Framework with the package
+    from sherlock.core import Sherlock
+
     try:
         runner = Sherlock()
-        runner.run()
+        if runner.config.serve:
+            from sherlock.server import serve
+
+            serve(runner, runner.config.serve)
+        elif runner.config.watch:
+            from sherlock.watch import watch
+
+            watch(runner)
+        else:
+            runner.run()
     except SherlockFatalError as err:
         print(f"Error: {err}")
         sys.exit(1)
@@ -0,0 +1,155 @@
+"""
+Persistent cache of parsed files and imported libraries.
+
+Cache entries are stored as JSON files in the cache directory. Entry is valid only if it was created with the same
+Robot Framework and Sherlock versions and cache format and the cached file did not change since - it has the same
+modification time and size or, if the modification time changed (for example after git checkout), the same content
+hash.
+
+Libraries are cached by their name and arguments. Library entry is valid only if the library source (module file
+or package files) and the version of the installed distribution providing it did not change.
+"""
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from robot.libraries import STDLIBS
+from robot.version import VERSION as ROBOT_VERSION
+
+from sherlock.model import LibraryData, ResourceData
+from sherlock.version import __version__
+
+RESOURCES_DIR = "resources"
+LIBRARIES_DIR = "libraries"
+FORMAT_VERSION = 6  # increase when the layout of the cached data changes
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def package_hash(path):
+    """Hash of the names, sizes and modification times of the Python files in the package."""
+    digest = hashlib.sha256()
+    for file in sorted(path.rglob("*.py")):
+        stat = file.stat()
+        digest.update(f"{file.relative_to(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+    return digest.hexdigest()
+
+
+@lru_cache()
+def _packages_distributions():
+    try:
+        return importlib.metadata.packages_distributions()
+    except AttributeError:  # Python < 3.10
+        return {}
+
+
+def distribution_version(module_name):
+    for distribution in _packages_distributions().get(module_name, [module_name]):
+        try:
+            return f"{distribution}=={importlib.metadata.version(distribution)}"
+        except importlib.metadata.PackageNotFoundError:
+            continue
+    return None
+
+
+def library_fingerprint(name):
+    """
+    Return fingerprint of the library source or None if the source can't be located without importing the library.
+    """
+    if name in STDLIBS:
+        return "stdlib"  # standard libraries are covered by Robot Framework version
+    version = None
+    source = Path(name)
+    if not source.exists():
+        module_name = name.split(".")[0]
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            return None
+        if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+            return None
+        source = Path(spec.origin)
+        version = distribution_version(module_name)
+    if source.is_dir():
+        source_hash = package_hash(source)
+    elif source.name == "__init__.py":
+        source_hash = package_hash(source.parent)
+    else:
+        source_hash = file_hash(source)
+    return f"{source}:{source_hash}:{version}"
+
+
+class Cache:
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.versions = {"robot": ROBOT_VERSION, "sherlock": __version__, "format": FORMAT_VERSION}
+
+    def get_entry_path(self, section, key):
+        return self.directory / section / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def read_entry(self, section, key):
+        try:
+            with open(self.get_entry_path(section, key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key or entry.get("versions") != self.versions:
+            return None
+        return entry
+
+    def write_entry(self, section, key, entry):
+        entry_path = self.get_entry_path(section, key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        entry = dict(entry, key=key, versions=self.versions)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, entry_path)  # atomic, so concurrent runs never read partially written entry
+
+    def get_resource(self, path):
+        """Return cached ResourceData of the file or None if it is not cached or the file has changed."""
+        key = str(path)
+        entry = self.read_entry(RESOURCES_DIR, key)
+        if entry is None:
+            return None
+        stat = os.stat(path)
+        if entry["size"] != stat.st_size:
+            return None
+        if entry["mtime"] != stat.st_mtime_ns:
+            if entry["hash"] != file_hash(path):
+                return None
+            self.write_entry(RESOURCES_DIR, key, dict(entry, mtime=stat.st_mtime_ns))
+        return ResourceData.from_dict(entry["data"])
+
+    def set_resource(self, path, data):
+        stat = os.stat(path)
+        entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": file_hash(path), "data": data.to_dict()}
+        self.write_entry(RESOURCES_DIR, str(path), entry)
+
+    @staticmethod
+    def get_library_key(name, args):
+        return json.dumps([name, list(args)], default=str)
+
+    def get_library(self, name, args):
+        """Return cached LibraryData or None if it is not cached or the library source has changed."""
+        entry = self.read_entry(LIBRARIES_DIR, self.get_library_key(name, args))
+        if entry is None:
+            return None
+        fingerprint = library_fingerprint(name)
+        if fingerprint is None or entry["fingerprint"] != fingerprint:
+            return None
+        return LibraryData.from_dict(entry["data"])
+
+    def set_library(self, name, args, data):
+        fingerprint = library_fingerprint(name)
+        if fingerprint is None:
+            return
+        entry = {"fingerprint": fingerprint, "data": data.to_dict()}
+        self.write_entry(LIBRARIES_DIR, self.get_library_key(name, args), entry)
@@ -0,0 +1,34 @@
+"""
+Client of the Sherlock server (``sherlock --serve``).
+
+It does not import Robot Framework nor Sherlock analysis modules, so it starts fast::
+
+    python -m sherlock.client /tmp/sherlock.sock '{"command": "usage", "keyword": "Open Browser"}'
+"""
+import json
+import socket
+import sys
+
+
+def query(socket_path, request, timeout=None):
+    """Send the request (dictionary) to the server listening on the Unix socket and return the response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(str(socket_path))
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    if len(args) != 2:
+        print("Usage: python -m sherlock.client SOCKET REQUEST", file=sys.stderr)
+        return 2
+    response = query(args[0], json.loads(args[1]))
+    print(json.dumps(response, indent=4))
+    return 0 if response.get("status") == "ok" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
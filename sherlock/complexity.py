@@ -1,70 +1,94 @@
-from collections import defaultdict
-
 from robot.api.parsing import ModelVisitor
 
-
-class PathNode:
-    def __init__(self, name):
-        self.name = name
+BRANCH_TYPES = frozenset({"ELSE IF", "ELSE", "EXCEPT", "FINALLY"})
 
 
 class ComplexityChecker(ModelVisitor):
+    """
+    Cyclomatic complexity and nesting depth of the keyword, counted while visiting the model without building the
+    control flow graph.
+
+    Every statement following the previous one adds an edge and a node to the graph, so it does not change E-N+2.
+    Every decision point (IF and ELSE IF branches, FOR and WHILE loops, EXCEPT branches) adds one independent path.
+    """
+
     def __init__(self):
-        self.nodes = defaultdict(list)
-        self.graph = None
-        self.tail = None
+        self.decisions = 0
+        self.entries = 0  # keywords with at least one statement, their entry node is part of the graph
+        self.in_keyword = False
+        self.entry_connected = False
+        self.depth = 0
+        self.max_depth = 0
 
-    def connect(self, node1, node2):
-        self.nodes[node1].append(node2)
-        self.nodes[node2] = []
+    def reset(self):
+        self.decisions = 0
+        self.entries = 0
+        self.max_depth = 0
 
     def complexity(self):
-        """mccabe V-E+2"""
-        edges = sum(len(n) for n in self.nodes.values())
-        nodes = len(self.nodes)
-        return edges - nodes + 2
-
-    def append_path_node(self, name):
-        if not self.tail:
-            return
-        path_node = PathNode(name)
-        self.connect(self.tail, path_node)
-        self.tail = path_node
-        return path_node
+        """mccabe E-N+2"""
+        return self.decisions - self.entries + 2
+
+    def add_statement(self):
+        """Count the statement following the previous one. Return False if it is not part of any keyword."""
+        if not self.in_keyword:
+            return False
+        if not self.entry_connected:
+            self.entry_connected = True
+            self.entries += 1
+        return True
+
+    def add_decision(self):
+        if self.add_statement():
+            self.decisions += 1
+
+    def visit_block(self, node):
+        """Visit the body of the block. Branches (ELSE, EXCEPT..) are on the same nesting level as the block."""
+        nested = getattr(node, "type", None) not in BRANCH_TYPES
+        if nested:
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+        self.generic_visit(node)
+        if nested:
+            self.depth -= 1
 
     def visit_Keyword(self, node):  # noqa
-        name = f"{node.name}:{node.lineno}:{node.col_offset}"
-        path_node = PathNode(name)
-        self.tail = path_node
+        self.in_keyword = True
+        self.entry_connected = False
         self.generic_visit(node)
 
     def visit_KeywordCall(self, node):  # noqa
-        name = f"KeywordCall {node.lineno}"
-        self.append_path_node(name)
+        self.add_statement()
 
     def visit_For(self, node):  # noqa
-        name = f"FOR {node.lineno}"
-        path_node = self.append_path_node(name)
-        self._parse_subgraph(node, path_node)
+        self.add_decision()
+        self.visit_block(node)
 
-    def visit_If(self, node):  # noqa
-        name = f"IF {node.lineno}"
-        path_node = self.append_path_node(name)
-        self._parse_subgraph(node, path_node)
+    def visit_While(self, node):  # noqa
+        self.add_decision()
+        self.visit_block(node)
 
-    def _parse_subgraph(self, node, path_node):
-        loose_ends = []
-        self.tail = path_node
-        self.generic_visit(node)
-        loose_ends.append(self.tail)
-        if getattr(node, "orelse", False):
-            self.tail = path_node
+    def visit_If(self, node):  # noqa
+        # the branches (ELSE IF and ELSE) are visited both as part of the IF block and as separate subgraphs
+        self.add_decision()
+        self.visit_block(node)
+        if node.orelse:
             self.generic_visit(node.orelse)
-            loose_ends.append(self.tail)
+
+    def visit_Try(self, node):  # noqa
+        if node.type == "EXCEPT":
+            self.add_decision()
         else:
-            loose_ends.append(path_node)
-        if path_node:
-            bottom = PathNode("")
-            for loose_end in loose_ends:
-                self.connect(loose_end, bottom)
-            self.tail = bottom
+            self.add_statement()
+        self.visit_block(node)
+
+
+def get_keyword_metrics(node):
+    """Return complexity, length (in lines) and nesting depth of the keyword model."""
+    checker = ComplexityChecker()
+    checker.visit(node)
+    return checker.complexity(), get_length(node), checker.max_depth
+
+
+def get_length(node):
+    return node.end_lineno - node.lineno + 1
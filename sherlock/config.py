@@ -3,13 +3,13 @@ import glob
 import os
 import string
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import toml
 from robot.conf import RobotSettings
 
 from sherlock.exceptions import SherlockFatalError
-from sherlock.file_utils import find_file_in_project_root, find_project_root, get_gitignore
+from sherlock.file_utils import find_file_in_project_root, find_project_root
 from sherlock.version import __version__
 
 BUILT_IN = "BuiltIn"
@@ -28,6 +28,22 @@ class PythonPath(argparse.Action):
         container.extend(paths)
 
 
+class Patterns(argparse.Action):
+    def __call__(self, parser, namespace, values, option_string=None):
+        patterns = getattr(namespace, self.dest, [])
+        setattr(namespace, self.dest, patterns + values.split(","))
+
+
+class OutputPaths(argparse.Action):
+    def __call__(self, parser, namespace, values, option_string=None):
+        outputs = getattr(namespace, self.dest, [])
+        setattr(namespace, self.dest, outputs + _process_output([values]))
+
+
+def _process_output(paths):
+    return [Path(globbed) for path in paths for globbed in sorted(glob.glob(str(path))) or [path]]
+
+
 def _process_pythonpath(paths):
     return [
         os.path.abspath(globbed)
@@ -64,16 +80,28 @@ def _split_pythonpath(path):
 class Config:
     def __init__(self, from_cli=True):
         self.path = Path.cwd()
-        self.output = None
+        self.output: List[Path] = []
         self.log_output = None
         self.report: List[str] = ["print"]
+        self.configure: List[str] = []
+        self.variance_threshold: Optional[float] = None
         self.variable = []
         self.variablefile = []
         self.pythonpath = []
         self.robot_settings = None
         self.include_builtin = False
+        self.stream_output = False
+        self.low_memory = False
+        self.jobs: Optional[int] = None
+        self.cache_dir: Optional[Path] = None
+        self.isolate_libraries = False
+        self.changed_since: Optional[str] = None
+        self.watch = False
+        self.serve: Optional[Path] = None
+        self.library_timeout = 60.0
+        self.exclude: List[str] = []
+        self.include: List[str] = []
         self.root = Path.cwd()
-        self.default_gitignore = None
         self.resource: List[str] = []
         if from_cli:
             self.parse_cli()
@@ -101,19 +129,19 @@ class Config:
             raise SherlockFatalError(f"Path to source code does not exist: '{self.path.resolve()}'")
 
     def validate_output(self):
-        if self.output is None:
+        if not self.output:
             output = (self.path if self.path.is_dir() else self.path.parent) / ROBOT_DEFAULT_OUTPUT
             if output.is_file():  # TODO document this
-                self.output = output
-        elif not self.output.is_file():
-            raise SherlockFatalError(
-                f"Reading Robot Framework output file failed. No such file: '{self.output}'"
-            ) from None
+                self.output = [output]
+            return
+        for output in self.output:
+            if not output.is_file():
+                raise SherlockFatalError(
+                    f"Reading Robot Framework output file failed. No such file: '{output}'"
+                ) from None
 
     def set_root(self, parsed_args):
         self.root = find_project_root((getattr(parsed_args, "path", Path.cwd()),))
-        if self.root:
-            self.default_gitignore = get_gitignore(self.root)
 
     def _create_parser(self) -> argparse.ArgumentParser:
         parser = argparse.ArgumentParser(
@@ -128,8 +156,9 @@ class Config:
         parser.add_argument(
             "-o",
             "--output",
-            type=Path,
-            help="Path to Robot Framework output file",
+            action=OutputPaths,
+            help="Path to Robot Framework output file. Use glob pattern or this option several times to analyse "
+            "multiple output files (for example pabot shards) - they are parsed in parallel",
         )
         parser.add_argument(
             "-r", "--resource", action="append", help="Path/name of the library or resource to be included in analysis"
@@ -139,7 +168,21 @@ class Config:
             "--report",
             action=CommaSeparated,
             help="Generate reports after analysis. Use comma separated list for multiple reports. "
-            "Available reports: print (default), html, json",
+            "Available reports: print (default), html, json, hotspots",
+        )
+        parser.add_argument(
+            "--configure",
+            action=Patterns,
+            metavar="report:param:value",
+            help="Configure the report parameter, for example 'print:sort_by:self_time'. "
+            "Use comma separated list or this option several times",
+        )
+        parser.add_argument(
+            "--variance-threshold",
+            type=float,
+            metavar="ratio",
+            help="Flag keywords in reports if the standard deviation of their execution times divided by the mean "
+            "time (coefficient of variation) is greater than given value, for example 0.5",
         )
         parser.add_argument(
             "-c",
@@ -161,6 +204,74 @@ class Config:
             help="Use this flag to include BuiltIn libraries in analysis",
             action="store_true",
         )
+        parser.add_argument(
+            "--stream-output",
+            help="Read Robot Framework output file incrementally instead of loading it whole into memory. "
+            "Recommended for large output files",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--low-memory",
+            help="Store variables of the files as plain values and create Robot Framework variable stores only "
+            "when they are used. Recommended for large source repositories",
+            action="store_true",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="Number of processes used for parsing source and output files. By default source files are parsed "
+            "sequentially and multiple output files are parsed using all available CPUs",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            type=Path,
+            help="Directory (for example .sherlock_cache) where results of parsing files are stored between runs. "
+            "Files that did not change since the previous run are not parsed again",
+        )
+        parser.add_argument(
+            "--changed-since",
+            metavar="ref",
+            help="Analyse again only suites affected by files changed since given git revision and reuse the "
+            "analysis of other suites from the snapshot stored for that revision. Requires --cache-dir",
+        )
+        parser.add_argument(
+            "--watch",
+            help="Keep running and analyse again after source files or output files change. Only changed files are "
+            "parsed again and already imported libraries are reused",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--serve",
+            type=Path,
+            metavar="socket",
+            help="Run as a server answering queries on given Unix socket. Mapped files and imported libraries are "
+            "kept in memory between queries",
+        )
+        parser.add_argument(
+            "--isolate-libraries",
+            help="Import libraries in separate processes. Libraries are imported concurrently and library that hangs "
+            "or crashes during import is reported as import error instead of stopping the analysis",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--library-timeout",
+            type=float,
+            help="Time in seconds after which the import of the library is stopped. "
+            "Used with --isolate-libraries (default: 60)",
+        )
+        parser.add_argument(
+            "--exclude",
+            action=Patterns,
+            help="Gitignore style pattern of files and directories (relative to the source directory) that are not "
+            "analysed, for example 'venv/,**/generated'. Use comma separated list or this option several times",
+        )
+        parser.add_argument(
+            "--include",
+            action=Patterns,
+            help="Gitignore style pattern of files (relative to the source directory) that are analysed. "
+            "If set, only matching files are analysed. Use comma separated list or this option several times",
+        )
         parser.add_argument(
             "-P",
             "--pythonpath",
@@ -218,13 +329,17 @@ class TomlConfigParser:
         for key, value in toml_data.items():
             if key == "log_output":
                 read_config[key] = argparse.FileType("w")(value)
-            elif key == "report":
+            elif key in ("report", "configure", "exclude", "include"):
                 read_config[key] = value.split(",") if isinstance(value, str) else value
             elif key == "config":
                 raise SherlockFatalError("Nesting configuration files is not allowed")
-            elif key == "output":
+            elif key in ("cache_dir", "serve"):
                 read_config[key] = Path(value)
-            elif key == "include_builtin":
+            elif key in ("library_timeout", "variance_threshold"):
+                read_config[key] = float(value)
+            elif key == "output":
+                read_config[key] = _process_output(value if isinstance(value, list) else [value])
+            elif key in ("include_builtin", "stream_output", "low_memory", "isolate_libraries", "watch"):
                 read_config[key] = str(value).lower() in ("true", "1", "yes", "t", "y")  # TODO tests
             elif key == "pythonpath":
                 read_config[key] = _process_pythonpath(value)
@@ -1,23 +1,43 @@
+import os
 import sys
 from pathlib import Path
 from typing import List, Optional
 
 from robot.api import ExecutionResult, TestSuiteBuilder
 
+from sherlock.cache import Cache
 from sherlock.config import BUILT_IN, Config
-from sherlock.model import Library, Resource, Tree
+from sherlock.file_utils import GitIgnore, PathFilter, get_gitignore, get_gitignore_rules
+from sherlock.incremental import IncrementalAnalysis
+from sherlock.loader import LibraryLoader
+from sherlock.model import KeywordIndex, Library, Tree, load_resource
 from sherlock.report import get_reports
+from sherlock.streaming import apply_summary, summarize_output, summarize_outputs, summarize_suite, visit_output
 from sherlock.visitor import StructureVisitor
 
 
+def forget_modules(paths):
+    """Remove library modules imported from given files, so changed libraries are imported again."""
+    paths = {os.path.normcase(path) for path in paths}
+    for name, module in list(sys.modules.items()):
+        source = getattr(module, "__file__", None)
+        if source and os.path.normcase(os.path.realpath(source)) in paths:
+            del sys.modules[name]
+
+
 class Sherlock:
     def __init__(self, config: Optional[Config] = None):
         self.config = Config() if config is None else config
-        self.reports = get_reports(self.config.report)
+        self.reports = get_reports(self.config.report, self.config.configure, self.config.variance_threshold)
         self.resources = dict()
+        self.keyword_index = None
         self.directory = None
         self.packages: List[Tree] = []
         self.from_output = bool(self.config.output)
+        self.cache = Cache(self.config.cache_dir) if self.config.cache_dir else None
+        self.incremental = None
+        self.reuse = {}
+        self.path_filter = PathFilter.from_patterns(self.config.exclude, self.config.include)
 
     def run(self):
         self.log("Sherlock analysis of Robot Framework code:\n")
@@ -26,23 +46,114 @@ class Sherlock:
         if self.config.pythonpath:
             sys.path = self.config.pythonpath + sys.path
 
-        if self.from_output:
-            suite = ExecutionResult(self.config.output).suite
-            self.log(f"Loaded {self.config.output.resolve()} output file")
-        else:
+        self.incremental = IncrementalAnalysis.from_config(self.config, self.cache)
+        if self.cache is not None and (self.incremental is None or self.incremental.revision is None):
+            self.log(
+                "Analysis snapshot will not be stored: source is not in a git repository or has uncommitted changes"
+            )
+        summaries, suite = self.load_results()
+        self.map_packages()
+        self.analyse(summaries, suite)
+        self.report()
+
+    def refresh(self, changed_paths):
+        """
+        Analyse the source again after the files with given paths changed. Files that did not change (and imported
+        libraries) are reused.
+        """
+        self.incremental = None
+        summaries, suite = self.load_results()
+        self.remap_packages(changed_paths)
+        self.reset_usage()
+        self.analyse(summaries, suite)
+        self.report()
+
+    def load_results(self):
+        """Return keyword calls summaries or the suite model to be analysed (none of them if the output is streamed)."""
+        summaries, suite = None, None
+        if len(self.config.output) > 1:
+            summaries = summarize_outputs(self.config.output, self.config.jobs)
+            self.log(f"Loaded {len(self.config.output)} output files")
+        elif self.from_output and self.incremental is not None:
+            summaries = [summarize_output(self.config.output[0])]
+            self.log(f"Loaded {self.config.output[0].resolve()} output file")
+        elif self.from_output and not self.config.stream_output:
+            suite = ExecutionResult(self.config.output[0]).suite
+            self.log(f"Loaded {self.config.output[0].resolve()} output file")
+        elif not self.from_output:
             suite = TestSuiteBuilder().build(self.config.path)
+            if self.incremental is not None:
+                summaries = [summarize_suite(suite)]
+        return summaries, suite
 
-        tree = self.map_resources_for_path(root)
+    def map_packages(self, reuse=None):
+        """Map resources and libraries. Files from ``reuse`` dictionary (path: file) are used instead of new ones."""
+        self.reuse = {} if reuse is None else reuse
+        tree = self.map_resources_for_path(self.config.path)
         self.packages.append(tree)
         self.packages.append(self.create_builtin_tree())
         self.packages.extend(self.map_resources())
+        self.reuse = {}
+        if self.keyword_index is None:
+            self.keyword_index = KeywordIndex.from_files(self.resources.values())
 
-        code_visitor = StructureVisitor(self.resources, self.from_output, self.config.robot_settings)
-        suite.visit(code_visitor)
+    def remap_packages(self, changed_paths):
+        """Map resources and libraries again, parsing and importing only the files with given (resolved) paths."""
+        if any(os.path.basename(path) == ".gitignore" for path in changed_paths):
+            get_gitignore.cache_clear()
+            get_gitignore_rules.cache_clear()
+        forget_modules(changed_paths)
+        previous = self.resources
+        self.resources = dict()
+        self.packages = []
+        self.map_packages(reuse={path: file for path, file in previous.items() if path not in changed_paths})
+        for path, file in previous.items():
+            if self.resources.get(path) is not file:
+                self.keyword_index.remove_file(file)
+        for file in self.resources.values():
+            self.keyword_index.add_file(file)
+
+    def reset_usage(self):
+        for file in self.resources.values():
+            for kw_stat in file.keywords:
+                kw_stat.reset_usage()
+
+    def analyse(self, summaries, suite):
+        """Visit the summaries or the suite (or stream the output file) and return the list of errors."""
+        library_loader = None
+        if self.config.isolate_libraries:
+            library_loader = LibraryLoader(self.config.library_timeout, self.config.jobs)
+        code_visitor = StructureVisitor(
+            self.resources,
+            self.from_output,
+            self.config.robot_settings,
+            keyword_index=self.keyword_index,
+            cache=self.cache,
+            library_loader=library_loader,
+        )
+        try:
+            if self.incremental is not None:
+                self.incremental.apply(summaries, code_visitor)
+                self.incremental.save(self.resources)
+                if self.incremental.previous is not None:
+                    self.log(
+                        f"Reused analysis of {self.incremental.reused} suites from revision "
+                        f"{self.incremental.previous.revision}, analysed {self.incremental.analysed} changed suites"
+                    )
+            elif summaries is not None:
+                for summary in summaries:
+                    apply_summary(summary, code_visitor)
+            elif suite is None:
+                visit_output(self.config.output[0], code_visitor)
+                self.log(f"Streamed {self.config.output[0].resolve()} output file")
+            else:
+                suite.visit(code_visitor)
+        finally:
+            if library_loader is not None:
+                library_loader.close()
         for error in code_visitor.errors:
             self.log(error)
-
-        self.report()
+        return code_visitor.errors
 
     def log(self, line: str):
         print(line, file=self.config.log_output)
@@ -55,7 +166,15 @@ class Sherlock:
                 report.get_report(tree, tree.name, self.config.root)
 
     def map_resources_for_path(self, root: Path):
-        tree = Tree.from_directory(path=root, gitignore=self.config.default_gitignore)
+        tree = Tree.from_directory(
+            path=root,
+            gitignore=GitIgnore.for_directory(root, self.config.root),
+            jobs=self.config.jobs or 1,
+            cache=self.cache,
+            path_filter=self.path_filter,
+            reuse=self.reuse,
+            low_memory=self.config.low_memory,
+        )
         self.resources.update({path: resource for path, resource in tree.get_resources()})
         return tree
 
@@ -66,20 +185,25 @@ class Sherlock:
             if resolved.is_dir():
                 yield self.map_resources_for_path(resolved)
             else:
-                if not resolved.exists() or resolved.suffix == ".py":
+                if str(resolved) in self.reuse:
+                    res_model = self.reuse[str(resolved)]
+                elif not resolved.exists() or resolved.suffix == ".py":
                     res_model = Library(resolved)
                 else:
-                    res_model = Resource(resolved)
+                    res_model = load_resource(resolved, self.cache, self.config.low_memory)
                 self.resources[str(resolved)] = res_model
                 tree = Tree(name=resource.name)
                 tree.children.append(res_model)
                 yield tree
 
     def create_builtin_tree(self):
-        built_in = Library(BUILT_IN)
-        built_in.load_library([], [], "builtin")
-        built_in.filter_not_used = True
-        built_in.builtin = True
+        if BUILT_IN in self.reuse:
+            built_in = self.reuse[BUILT_IN]
+        else:
+            built_in = Library(BUILT_IN)
+            built_in.load_library([], [], "builtin", self.cache)
+            built_in.filter_not_used = True
+            built_in.builtin = True
 
         self.resources[BUILT_IN] = built_in
         tree = Tree(name=BUILT_IN)
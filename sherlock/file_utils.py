@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from pathspec import PathSpec
 
@@ -19,6 +19,97 @@ def get_gitignore(root: Path) -> PathSpec:
     return PathSpec.from_lines("gitwildmatch", lines)
 
 
+@lru_cache()
+def get_gitignore_rules(directory: Path):
+    """
+    Return rules of the .gitignore file in the directory as a tuple of ``(regex, ignore)`` pairs in the reversed
+    order, so the first matching rule decides whether the path is ignored (``ignore`` is False for negated patterns).
+    """
+    spec = get_gitignore(directory)
+    return tuple((pattern.regex, pattern.include) for pattern in reversed(spec.patterns) if pattern.include is not None)
+
+
+class GitIgnore:
+    """
+    Gitignore rules applying to the scanned directory, collected from .gitignore files in the directory and its
+    parents up to the project root.
+
+    Every rule set is stored with the path of the scanned directory relative to the directory of its .gitignore file.
+    The deepest .gitignore file with a rule matching the path decides if the path is ignored.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = rules  # tuple of (path prefix, rules) ordered from the project root
+
+    @classmethod
+    def for_directory(cls, directory: Path, root: Optional[Path]) -> "GitIgnore":
+        """Return rules from .gitignore files of the directory parents up to the root (without the directory)."""
+        gitignore = cls()
+        directory = directory.resolve()
+        if root is None:
+            return gitignore
+        root = root.resolve()
+        if directory != root and root not in directory.parents:
+            return gitignore
+        for name in directory.relative_to(root).parts:
+            gitignore = gitignore.with_file(root).descend(name)
+            root = root / name
+        return gitignore
+
+    def with_file(self, directory: Path) -> "GitIgnore":
+        """Add rules from the .gitignore file in the currently scanned directory."""
+        rules = get_gitignore_rules(directory)
+        if not rules:
+            return self
+        return GitIgnore(self.rules + (("", rules),))
+
+    def descend(self, name: str) -> "GitIgnore":
+        """Return rules for the subdirectory of the currently scanned directory."""
+        return GitIgnore(tuple((f"{prefix}{name}/", rules) for prefix, rules in self.rules))
+
+    def is_ignored(self, name: str, is_dir: bool) -> bool:
+        """Check if the file or directory in the currently scanned directory is ignored."""
+        name = f"{name}/" if is_dir else name
+        for prefix, rules in reversed(self.rules):
+            path = prefix + name
+            for regex, ignore in rules:
+                if regex.match(path):
+                    return ignore
+        return False
+
+
+def compile_patterns(patterns: List[str]) -> Optional[PathSpec]:
+    """Return a PathSpec matching gitignore style patterns or None if there are no patterns."""
+    if not patterns:
+        return None
+    return PathSpec.from_lines("gitwildmatch", patterns)
+
+
+class PathFilter:
+    """
+    Filter files and directories scanned for resources and libraries with ``--exclude`` and ``--include`` patterns.
+
+    Paths are matched relative to the scanned directory. Excluded directories are not scanned at all. If include
+    patterns are set, only matching files are scanned.
+    """
+
+    def __init__(self, exclude: Optional[PathSpec] = None, include: Optional[PathSpec] = None):
+        self.exclude = exclude
+        self.include = include
+
+    @classmethod
+    def from_patterns(cls, exclude: List[str], include: List[str]):
+        return cls(compile_patterns(exclude), compile_patterns(include))
+
+    def skip_directory(self, relative_path: str) -> bool:
+        return self.exclude is not None and self.exclude.match_file(f"{relative_path}/")
+
+    def skip_file(self, relative_path: str) -> bool:
+        if self.exclude is not None and self.exclude.match_file(relative_path):
+            return True
+        return self.include is not None and not self.include.match_file(relative_path)
+
+
 def find_project_root(paths) -> Path:
     """Return a directory containing .git or pyproject.toml.
     That directory will be a common parent of all files and directories
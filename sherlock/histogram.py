@@ -0,0 +1,71 @@
+"""
+Sparse log-linear histogram of execution times.
+
+Times shorter than ``2 ** SUB_BUCKET_BITS`` milliseconds have their own buckets. Longer times are grouped into
+``2 ** (SUB_BUCKET_BITS - 1)`` buckets per power of two, so the relative error of reported percentiles is below
+``2 ** (1 - SUB_BUCKET_BITS)`` (1.6%). Only non-empty buckets are stored and the number of buckets is bounded by the
+range of times (about 64 buckets per power of two), regardless of the number of recorded executions. Histograms are
+merged by adding counts of the same buckets.
+"""
+import math
+
+SUB_BUCKET_BITS = 7
+LINEAR_LIMIT = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS = LINEAR_LIMIT >> 1
+
+
+def bucket_index(value):
+    """Return index of the bucket holding the value (non-negative number of milliseconds)."""
+    value = int(value)
+    if value < LINEAR_LIMIT:
+        return max(value, 0)
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return shift * HALF_SUB_BUCKETS + (value >> shift)
+
+
+def bucket_upper_bound(index):
+    """Return the highest value stored in the bucket with given index."""
+    if index < LINEAR_LIMIT:
+        return index
+    shift, mantissa = divmod(index - HALF_SUB_BUCKETS, HALF_SUB_BUCKETS)
+    return ((mantissa + HALF_SUB_BUCKETS + 1) << shift) - 1
+
+
+class Histogram:
+    __slots__ = ("counts", "count")
+
+    def __init__(self, counts=None):
+        self.counts = {} if counts is None else counts  # bucket index: number of values
+        self.count = sum(self.counts.values())
+
+    def add(self, value):
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+
+    def copy(self):
+        return Histogram(dict(self.counts))
+
+    def percentile(self, percent):
+        """Return the value below or equal to which is given percent of values (None if the histogram is empty)."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return bucket_upper_bound(index)
+        return bucket_upper_bound(max(self.counts))
+
+    def to_list(self):
+        return [[index, self.counts[index]] for index in sorted(self.counts)]
+
+    @classmethod
+    def from_list(cls, data):
+        return cls({index: count for index, count in data})
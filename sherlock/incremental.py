@@ -0,0 +1,264 @@
+"""
+Incremental analysis of the changes since a git revision.
+
+Every run with ``--cache-dir`` in a git repository without uncommitted changes stores a snapshot of the analysis
+of the current commit. The snapshot contains, for every suite, the digest of keyword calls found in the suite (without
+their execution times), the files the keywords were searched in (the suite file and everything it imports, also
+transitively) and the keyword definitions resolved for every call.
+
+With ``--changed-since`` the snapshot created for the given revision is loaded and only suites with different calls
+or importing any file changed since the revision are analysed again. For the other suites the execution times from
+the current output are added to the keyword definitions from the snapshot, without resolving the keywords again.
+Unchanged resource files are not parsed again thanks to the cache.
+"""
+import hashlib
+import subprocess
+from collections import OrderedDict
+from pathlib import Path
+
+from sherlock.exceptions import SherlockFatalError
+from sherlock.streaming import KeywordCalls, apply_calls
+
+SNAPSHOTS_DIR = "snapshots"
+
+
+def run_git(args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+def get_revision(root, ignored=()):
+    """
+    Return commit of the HEAD or None if it is not a git repository or there are uncommitted changes. Untracked files
+    (like output files and reports) and changes in ``ignored`` paths (like the cache directory) are not checked.
+    """
+    try:
+        top_level = Path(run_git(["rev-parse", "--show-toplevel"], root).strip()).resolve()
+        pathspecs = [":/"]
+        for path in ignored:
+            path = Path(path).resolve()
+            if top_level in path.parents:
+                pathspecs.append(f":(top,exclude){path.relative_to(top_level).as_posix()}")
+        if run_git(["status", "--porcelain", "--untracked-files=no", "--", *pathspecs], root).strip():
+            return None
+        return run_git(["rev-parse", "HEAD"], root).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def resolve_revision(ref, root):
+    try:
+        return run_git(["rev-parse", "--verify", f"{ref}^{{commit}}"], root).strip()
+    except OSError as err:
+        raise SherlockFatalError(f"Failed to run git: {err}") from None
+    except subprocess.CalledProcessError as err:
+        raise SherlockFatalError(f"Failed to resolve git revision '{ref}': {err.stderr.strip()}") from None
+
+
+def get_changed_files(revision, root):
+    """Return resolved paths of files changed (also deleted and not yet committed) since the revision."""
+    top_level = run_git(["rev-parse", "--show-toplevel"], root).strip()
+    changed = run_git(["diff", "--name-only", "-z", revision, "--"], top_level)
+    untracked = run_git(["ls-files", "--others", "--exclude-standard", "-z"], top_level)
+    return {str(Path(top_level, name).resolve()) for name in (changed + untracked).split("\0") if name}
+
+
+def get_calls_digest(suite_calls):
+    digest = hashlib.sha1()
+    _update_digest(digest, suite_calls)
+    return digest.hexdigest()
+
+
+def _update_digest(digest, parent):
+    # only the structure of the calls, execution times are different in every output file
+    for key, calls in parent.children.items():
+        digest.update(repr((key, calls.used)).encode("utf-8"))
+        _update_digest(digest, calls)
+        digest.update(b")")
+
+
+def get_call_paths(parent, path=()):
+    """Return dictionary with call paths (tuples of ``KeywordCalls`` keys) of all calls by their ids."""
+    call_paths = {}
+    for key, calls in parent.children.items():
+        call_paths[id(calls)] = path + (key,)
+        call_paths.update(get_call_paths(calls, path + (key,)))
+    return call_paths
+
+
+def get_calls(parent, call_path):
+    for key in call_path:
+        parent = parent.children[key]
+    return parent
+
+
+class SuiteSnapshot:
+    def __init__(self, digest, closure, usage):
+        self.digest = digest
+        self.closure = closure  # paths of the files the keywords of the suite are searched in
+        self.usage = usage  # list of (call path, file key, keyword name) of resolved calls
+
+    def to_dict(self):
+        return {
+            "digest": self.digest,
+            "closure": sorted(self.closure),
+            "usage": [[[list(key) for key in call_path], path, name] for call_path, path, name in self.usage],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        usage = [(tuple(tuple(key) for key in call_path), path, name) for call_path, path, name in data["usage"]]
+        return cls(data["digest"], set(data["closure"]), usage)
+
+
+class Snapshot:
+    def __init__(self, revision, settings, suites=None):
+        self.revision = revision
+        self.settings = settings
+        self.suites = {} if suites is None else suites
+
+    def to_dict(self):
+        return {
+            "revision": self.revision,
+            "settings": self.settings,
+            "suites": {source: suite.to_dict() for source, suite in self.suites.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        suites = {source: SuiteSnapshot.from_dict(suite) for source, suite in data["suites"].items()}
+        return cls(data["revision"], data["settings"], suites)
+
+
+class IncrementalAnalysis:
+    """Apply keyword calls summaries to the visitor, reusing unchanged suites from the previous snapshot."""
+
+    def __init__(self, cache, source, settings, revision, previous=None, changed_files=None):
+        self.cache = cache
+        self.source = source
+        self.settings = settings
+        self.revision = revision
+        self.previous = previous
+        self.changed_files = set() if changed_files is None else changed_files
+        self.snapshot = Snapshot(revision, settings)
+        self.suite_usage = {}
+        self.reused = 0
+        self.analysed = 0
+
+    @staticmethod
+    def get_snapshot_key(source, revision):
+        return f"{source}@{revision}"
+
+    @classmethod
+    def from_config(cls, config, cache):
+        """
+        Return IncrementalAnalysis or None if the snapshot can't be stored nor used. Raises SherlockFatalError if
+        ``--changed-since`` is used without the cache directory or the revision is not valid.
+        """
+        if cache is None:
+            if config.changed_since:
+                raise SherlockFatalError("--changed-since option requires --cache-dir to store analysis snapshots")
+            return None
+        source = str(Path(config.path).resolve())
+        settings = {
+            "variable": [str(variable) for variable in config.variable],
+            "variablefile": [str(variable_file) for variable_file in config.variablefile],
+            "pythonpath": [str(path) for path in config.pythonpath],
+        }
+        analysis = cls(cache, source, settings, get_revision(config.root, ignored=[config.cache_dir]))
+        if config.changed_since:
+            base_revision = resolve_revision(config.changed_since, config.root)
+            entry = cache.read_entry(SNAPSHOTS_DIR, cls.get_snapshot_key(source, base_revision))
+            previous = Snapshot.from_dict(entry["snapshot"]) if entry else None
+            if previous is not None and previous.revision == base_revision and previous.settings == settings:
+                analysis.previous = previous
+                analysis.changed_files = get_changed_files(base_revision, config.root)
+        if analysis.revision is None and analysis.previous is None:
+            return None
+        return analysis
+
+    def apply(self, summaries, visitor):
+        suites = OrderedDict()
+        merged = set()
+        for summary in summaries:
+            for source, suite_calls in summary:
+                if source not in suites:
+                    suites[source] = suite_calls
+                    continue
+                if source not in merged:  # merge into a copy, summaries are not modified
+                    merged.add(source)
+                    first, suites[source] = suites[source], KeywordCalls()
+                    suites[source].merge(first)
+                suites[source].merge(suite_calls)
+        for source, suite_calls in suites.items():
+            key = str(source)
+            digest = get_calls_digest(suite_calls)
+            if self.reuse_suite(key, digest, suite_calls, visitor):
+                self.reused += 1
+                continue
+            visitor.set_suite_context(source)
+            usage = []
+            apply_calls(suite_calls, visitor, usage=usage)
+            call_paths = get_call_paths(suite_calls)
+            usage = [(call_paths[id(calls)], kw_stat) for kw_stat, calls in usage]
+            self.suite_usage[key] = (digest, self.get_closure(visitor, key), usage)
+            self.analysed += 1
+
+    def reuse_suite(self, key, digest, suite_calls, visitor):
+        """
+        Add executions of the suite calls to the keywords resolved in the previous snapshot if the suite did not
+        change. Return True if reused.
+        """
+        if self.previous is None or key not in self.previous.suites:
+            return False
+        suite = self.previous.suites[key]
+        if suite.digest != digest or not self.changed_files.isdisjoint(suite.closure):
+            return False
+        definitions = self.find_definitions(suite, visitor.resources)
+        if definitions is None:  # libraries are loaded on demand, import them the same way as in the suite
+            visitor.set_suite_context(key)
+            definitions = self.find_definitions(suite, visitor.resources)
+            if definitions is None:
+                return False
+        for kw_stat, (call_path, _, _) in zip(definitions, suite.usage):
+            calls = get_calls(suite_calls, call_path)
+            kw_stat.used += calls.used
+            kw_stat.timings.merge(calls.timings)
+        self.snapshot.suites[key] = suite
+        return True
+
+    @staticmethod
+    def find_definitions(suite, resources):
+        definitions = []
+        for _, path, name in suite.usage:
+            file = resources.get(path)
+            kw_stat = file.keywords.get(name) if file is not None and file.keywords else None
+            if kw_stat is None:
+                return None
+            definitions.append(kw_stat)
+        return definitions
+
+    @staticmethod
+    def get_closure(visitor, source):
+        closure = {source, *visitor.imported_resources}
+        if visitor.suite_resource:
+            closure.add(str(visitor.suite_resource.path))
+        closure.update(str(library.path) for library in visitor.imported_libraries.values())
+        return closure
+
+    def save(self, resources):
+        """Store the snapshot of the analysis if the analysed code is committed."""
+        if self.revision is None:
+            return
+        definitions = {
+            id(kw_stat): (path, kw_stat.name) for path, file in resources.items() for kw_stat in file.keywords
+        }
+        for key, (digest, closure, calls_usage) in self.suite_usage.items():
+            usage = []
+            for call_path, kw_stat in calls_usage:
+                if id(kw_stat) not in definitions:
+                    break  # defined outside of mapped files, suite will be analysed again in the next run
+                usage.append((call_path, *definitions[id(kw_stat)]))
+            else:
+                self.snapshot.suites[key] = SuiteSnapshot(digest, closure, usage)
+        snapshot_key = self.get_snapshot_key(self.source, self.revision)
+        self.cache.write_entry(SNAPSHOTS_DIR, snapshot_key, {"snapshot": self.snapshot.to_dict()})
@@ -0,0 +1,131 @@
+"""
+Importing libraries in separate processes.
+
+Every library is imported in its own short-lived process, so libraries can be imported concurrently and importing
+one library can't change ``sys.path`` or module state seen by the other libraries. Import that takes longer than
+the timeout is killed and reported as import error.
+"""
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+from collections import deque
+
+from robot.errors import DataError
+
+from sherlock.model import introspect_library
+
+
+def _import_library(connection, name, args, path):
+    sys.path = path
+    try:
+        connection.send(("ok", introspect_library(name, args)))
+    except DataError as err:
+        connection.send(("error", str(err)))
+    except BaseException as err:  # library can raise anything, including SystemExit, during import
+        connection.send(("error", f"Importing library '{name}' failed: {err!r}"))
+    finally:
+        connection.close()
+
+
+class LibraryImport:
+    def __init__(self, loader, name, args):
+        self.loader = loader
+        self.name = name
+        self.args = args
+        self.process = None
+        self.deadline = None
+        self.data = None
+        self.error = None
+        self.done = False
+
+    @property
+    def key(self):
+        return self.name, tuple(self.args)
+
+    def finish(self, data=None, error=None):
+        self.data, self.error, self.done = data, error, True
+
+    def result(self):
+        """Wait for the import and return LibraryData. Raises DataError if the import failed or timed out."""
+        return self.loader.result(self)
+
+
+class LibraryLoader:
+    def __init__(self, timeout, processes=None):
+        self.timeout = timeout
+        self.processes = processes or os.cpu_count() or 1
+        self.context = multiprocessing.get_context()
+        self.queue = deque()
+        self.running = {}
+        self.timed_out = set()
+
+    def submit(self, name, args):
+        """Schedule import of the library and return LibraryImport handle."""
+        handle = LibraryImport(self, name, args)
+        if handle.key in self.timed_out:  # do not wait for the same hanging library again
+            handle.finish(error=self.timeout_message(name))
+            return handle
+        self.queue.append(handle)
+        self.start_processes()
+        return handle
+
+    def timeout_message(self, name):
+        return f"Importing library '{name}' timed out after {self.timeout} seconds"
+
+    def start_processes(self):
+        while self.queue and len(self.running) < self.processes:
+            handle = self.queue.popleft()
+            receiver, sender = self.context.Pipe(duplex=False)
+            handle.process = self.context.Process(
+                target=_import_library, args=(sender, handle.name, handle.args, sys.path), daemon=True
+            )
+            handle.process.start()
+            sender.close()
+            handle.deadline = time.monotonic() + self.timeout
+            self.running[receiver] = handle
+
+    def result(self, handle):
+        while not handle.done:
+            self.wait()
+        if handle.error:
+            raise DataError(handle.error)
+        return handle.data
+
+    def wait(self):
+        """Wait until any running import finishes or times out and start queued imports."""
+        timeout = max(0.0, min(handle.deadline for handle in self.running.values()) - time.monotonic())
+        for connection in multiprocessing.connection.wait(list(self.running), timeout):
+            handle = self.running.pop(connection)
+            try:
+                status, value = connection.recv()
+            except EOFError:
+                status, value = "error", f"Importing library '{handle.name}' failed: process exited unexpectedly"
+            connection.close()
+            handle.process.join()
+            if status == "ok":
+                handle.finish(data=value)
+            else:
+                handle.finish(error=value)
+        now = time.monotonic()
+        for connection, handle in list(self.running.items()):
+            if handle.deadline <= now:
+                self.running.pop(connection)
+                self.kill(connection, handle)
+                self.timed_out.add(handle.key)
+                handle.finish(error=self.timeout_message(handle.name))
+        self.start_processes()
+
+    @staticmethod
+    def kill(connection, handle):
+        connection.close()
+        handle.process.kill()
+        handle.process.join()
+
+    def close(self):
+        """Kill all imports that are still running."""
+        self.queue.clear()
+        for connection, handle in self.running.items():
+            self.kill(connection, handle)
+        self.running.clear()
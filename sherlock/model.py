@@ -1,19 +1,21 @@
-import ast
 import math
+import os
 import textwrap
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 import robot.errors
-from pathspec import PathSpec
 from robot.api import get_model
 from robot.running.arguments import EmbeddedArguments
 from robot.running.testlibraries import TestLibrary
-from robot.utils import NormalizedDict
+from robot.utils import NormalizedDict, normalize
 from robot.variables import Variables
 
-from sherlock.complexity import ComplexityChecker
-from sherlock.file_utils import INCLUDE_EXT
+from sherlock.complexity import ComplexityChecker, get_keyword_metrics, get_length
+from sherlock.file_utils import INCLUDE_EXT, GitIgnore, PathFilter
+from sherlock.histogram import Histogram
 
 DIRECTORY_TYPE = "Directory"
 RESOURCE_TYPE = "Resource"
@@ -21,13 +23,35 @@ LIBRARY_TYPE = "Library"
 SUITE_TYPE = "Suite"
 
 
+def get_embedded_pattern(name):
+    """Return compiled pattern of the keyword with embedded arguments or None if the name has no embedded arguments."""
+    try:
+        if hasattr(EmbeddedArguments, "from_name"):  # Robot Framework 6.1+
+            embedded = EmbeddedArguments.from_name(name)
+        else:
+            embedded = EmbeddedArguments(name)
+    except robot.errors.DataError:
+        return None
+    return embedded.name if embedded and embedded.args else None
+
+
 class KeywordStats:
-    def __init__(self, name, parent, node=None):
+    __slots__ = ("name", "parent", "used", "complexity", "length", "nesting_depth", "timings")
+
+    def __init__(self, name, parent, node=None, complexity=None, length=None, nesting_depth=None):
+        """The parsed keyword ``node`` is only used to compute the metrics if they are not given, it is not kept."""
         self.name = name
         self.parent = parent
         self.used = 0
-        self.node = node
-        self.complexity = self.get_complexity()
+        if node is not None and complexity is None:
+            complexity, length, nesting_depth = get_keyword_metrics(node)
+        self.complexity = complexity
+        self.length = length
+        self.nesting_depth = nesting_depth
+        self.timings = KeywordTimings()
+
+    def reset_usage(self):
+        self.used = 0
         self.timings = KeywordTimings()
 
     @property
@@ -48,34 +72,137 @@ class KeywordStats:
             s += textwrap.indent(str(self.timings), "    ")
         return s
 
-    def get_complexity(self):
-        if not self.node:
-            return None
-        checker = ComplexityChecker()
-        checker.visit(self.node)
-        return checker.complexity()
-
 
 class KeywordTimings:
+    """
+    Execution times of the keyword in milliseconds. Besides the minimum, maximum and total time, the distribution of
+    the times is kept in the histogram, so percentiles of the times can be reported. The histogram is created with the
+    first execution, most keywords (for example of libraries) are never executed. Self time is the time of the
+    keyword without the time of keywords called by it.
+
+    Variance of the times is accumulated with Welford's algorithm (running mean and sum of squared differences from
+    the mean) and timings are merged with Chan's formula, so it stays numerically stable for long times and many
+    executions.
+    """
+
+    __slots__ = ("_max", "_min", "_avg", "_total", "_self_total", "_count", "_histogram", "_mean", "_m2")
+
+    PERCENTILES = (50, 90, 99)
+
     def __init__(self):
         self._max = 0
         self._min = math.inf
         self._avg = 0
         self._total = 0
+        self._self_total = 0
         self._count = 0
+        self._histogram = None
+        self._mean = 0.0
+        self._m2 = 0.0
 
-    def add_timing(self, elapsed):
+    def add_timing(self, elapsed, self_elapsed=None):
         self._count += 1
         self._max = max(self._max, elapsed)
         self._min = min(self._min, elapsed)
         self._total += elapsed
+        self._self_total += elapsed if self_elapsed is None else self_elapsed
+        self._avg = math.floor(self._total / self._count)
+        if self._histogram is None:
+            self._histogram = Histogram()
+        self._histogram.add(elapsed)
+        delta = elapsed - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (elapsed - self._mean)
+
+    def merge(self, other):
+        """Add executions aggregated in other timings to this one."""
+        if not other._count:
+            return
+        delta = other._mean - self._mean
+        count = self._count + other._count
+        self._mean += delta * other._count / count
+        self._m2 += other._m2 + delta * delta * self._count * other._count / count
+        self._count = count
+        self._max = max(self._max, other._max)
+        self._min = min(self._min, other._min)
+        self._total += other._total
+        self._self_total += other._self_total
         self._avg = math.floor(self._total / self._count)
+        if self._histogram is None:
+            self._histogram = other._histogram.copy()
+        else:
+            self._histogram.merge(other._histogram)
+
+    def percentile(self, percent):
+        """Return given percentile of execution times in milliseconds or None if there were no executions."""
+        value = None if self._histogram is None else self._histogram.percentile(percent)
+        if value is None:
+            return None
+        return min(max(value, self._min), self._max)
+
+    def percentiles(self):
+        return {f"p{percent}": self.percentile(percent) for percent in self.PERCENTILES}
+
+    @property
+    def variance(self):
+        """Population variance of execution times in milliseconds squared or None if there were no executions."""
+        if not self._count:
+            return None
+        return self._m2 / self._count
+
+    @property
+    def stddev_ms(self):
+        if not self._count:
+            return None
+        return math.sqrt(self.variance)
+
+    @property
+    def coefficient_of_variation(self):
+        """Standard deviation relative to the mean time or None if there were no executions or the mean is 0."""
+        if not self._count or not self._mean:
+            return None
+        return self.stddev_ms / self._mean
+
+    def has_high_variance(self, threshold):
+        """Return True if the coefficient of variation is greater than the threshold (disabled with None)."""
+        if threshold is None:
+            return False
+        variation = self.coefficient_of_variation
+        return variation is not None and variation > threshold
+
+    def to_dict(self):
+        return {
+            "count": self._count,
+            "max": self._max,
+            "min": self._min if self._count else None,
+            "total": self._total,
+            "self_total": self._self_total,
+            "histogram": [] if self._histogram is None else self._histogram.to_list(),
+            "mean": self._mean,
+            "m2": self._m2,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        timings = cls()
+        if data["count"]:
+            timings._count, timings._max, timings._min, timings._total, timings._self_total = (
+                data["count"],
+                data["max"],
+                data["min"],
+                data["total"],
+                data["self_total"],
+            )
+            timings._avg = math.floor(timings._total / timings._count)
+            timings._histogram = Histogram.from_list(data["histogram"])
+            timings._mean, timings._m2 = data["mean"], data["m2"]
+        return timings
 
     def format_time(self, milliseconds):
         if not self._count:
             return "0"
         seconds = milliseconds / 1000
-        return str(round(seconds))
+        return str(round(seconds, 3))
 
     @property
     def max(self):
@@ -109,24 +236,58 @@ class KeywordTimings:
     def total(self, value):
         self._total = value
 
+    @property
+    def self_total(self):
+        return self.format_time(self._self_total)
+
+    @property
+    def stddev(self):
+        return self.format_time(self.stddev_ms)
+
+    @property
+    def total_ms(self):
+        return self._total
+
+    @property
+    def self_total_ms(self):
+        return self._self_total
+
+    @property
+    def p50(self):
+        return self.format_time(self.percentile(50))
+
+    @property
+    def p90(self):
+        return self.format_time(self.percentile(90))
+
+    @property
+    def p99(self):
+        return self.format_time(self.percentile(99))
+
     def __add__(self, other):
+        """
+        Return new timings with executions of both timings. Adding is associative and commutative, with empty
+        timings as the identity, so partial timings (for example from output shards) can be added in any order.
+        """
         timing = KeywordTimings()
-        timing.max = self._max
-        timing.min = self._min
-        timing._count = self._count
-        timing.avg = self._avg
-        timing.total = self._total
-
-        if other._count:
-            timing.add_timing(other._total)
+        timing.merge(self)
+        timing.merge(other)
         return timing
 
     def __radd__(self, other):
+        if other == 0:  # start value of sum()
+            return self.__add__(KeywordTimings())
         return self.__add__(other)
 
 
-class ResourceVisitor(ast.NodeVisitor):
+class ResourceVisitor(ComplexityChecker):
+    """
+    Collect keywords, imports and variables of the resource file together with metrics of the keywords in a single
+    pass over the parsed model.
+    """
+
     def __init__(self, parent):
+        super().__init__()
         self.parent = parent
         self.normal_keywords = NormalizedDict(ignore="_")
         self.embedded_keywords = dict()
@@ -139,13 +300,24 @@ class ResourceVisitor(ast.NodeVisitor):
         self.has_tests = True
 
     def visit_Keyword(self, node):  # noqa
-        embedded = EmbeddedArguments(node.name)
-        if embedded and embedded.args:
-            self.embedded_keywords[node.name] = (KeywordStats(node.name, parent=self.parent, node=node), embedded.name)
+        self.reset()
+        super().visit_Keyword(node)
+        self.in_keyword = False
+        kw_stat = KeywordStats(
+            node.name,
+            parent=self.parent,
+            complexity=self.complexity(),
+            length=get_length(node),
+            nesting_depth=self.max_depth,
+        )
+        self.add_keyword(kw_stat)
+
+    def add_keyword(self, kw_stat):
+        pattern = get_embedded_pattern(kw_stat.name)
+        if pattern:
+            self.embedded_keywords[kw_stat.name] = (kw_stat, pattern)
         else:
-            self.normal_keywords[node.name] = KeywordStats(
-                node.name, parent=self.parent, node=node
-            )  # TODO: handle duplications
+            self.normal_keywords[kw_stat.name] = kw_stat  # TODO: handle duplications
 
     def visit_ResourceImport(self, node):  # noqa
         if node.name:
@@ -174,55 +346,245 @@ class ResourceVisitor(ast.NodeVisitor):
         return ret
 
 
+class EmbeddedKeywordsIndex:
+    """
+    Index of keywords with embedded arguments.
+
+    Patterns are stored in a trie by their literal prefix (text before the first embedded argument). Searching walks
+    the trie once with the keyword name and only patterns with matching prefix are checked with regex.
+    """
+
+    PATTERNS = None  # trie node key holding patterns, never clashes with single characters
+
+    def __init__(self):
+        self.trie = {}
+        self.size = 0
+
+    def add(self, name, pattern, kw_stat):
+        node = self.trie
+        for char in name.split("${", maxsplit=1)[0].lower():
+            node = node.setdefault(char, {})
+        node.setdefault(self.PATTERNS, []).append((self.size, pattern, kw_stat))
+        self.size += 1
+
+    def find(self, name):
+        """Return all keywords matching the name in the order they were added."""
+        node = self.trie
+        candidates = list(node.get(self.PATTERNS, ()))
+        for char in name.lower():
+            node = node.get(char)
+            if node is None:
+                break
+            candidates.extend(node.get(self.PATTERNS, ()))
+        return [kw_stat for _, pattern, kw_stat in sorted(candidates, key=lambda c: c[0]) if pattern.match(name)]
+
+
+class ResourceData:
+    """
+    Compact and picklable result of parsing the resource file.
+
+    It is used to send parsed resources between processes without parsed model or Robot Framework objects.
+    """
+
+    def __init__(self, keywords, has_tests, resources, libraries, variables):
+        self.keywords = keywords  # list of (name, complexity, length, nesting depth)
+        self.has_tests = has_tests
+        self.resources = resources
+        self.libraries = libraries
+        self.variables = variables  # list of (name, value)
+
+    @staticmethod
+    def plain_value(value):
+        if isinstance(value, dict):
+            return dict(value)
+        if isinstance(value, (list, tuple)):
+            return list(value)
+        return value
+
+    def to_dict(self):
+        """Return JSON serializable dictionary with the data."""
+        return {
+            "keywords": [list(keyword) for keyword in self.keywords],
+            "has_tests": self.has_tests,
+            "resources": list(self.resources),
+            "libraries": [[name, alias, list(args)] for (name, alias), args in self.libraries.items()],
+            "variables": [list(variable) for variable in self.variables],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            keywords=[tuple(keyword) for keyword in data["keywords"]],
+            has_tests=data["has_tests"],
+            resources=data["resources"],
+            libraries={(name, alias): tuple(args) for name, alias, args in data["libraries"]},
+            variables=[tuple(variable) for variable in data["variables"]],
+        )
+
+    def to_visitor(self, parent):
+        """Return ResourceVisitor filled with the data as if it visited the parsed model."""
+        visitor = ResourceVisitor(parent)
+        for name, complexity, length, nesting_depth in self.keywords:
+            kw_stat = KeywordStats(
+                name, parent=parent, complexity=complexity, length=length, nesting_depth=nesting_depth
+            )
+            visitor.add_keyword(kw_stat)
+        visitor.has_tests = self.has_tests
+        visitor.resources = self.resources
+        visitor.libraries = self.libraries
+        for name, value in self.variables:
+            visitor.variables[name] = value
+        return visitor
+
+
+class LibraryData:
+    """Compact and picklable result of importing the library - its name and names of its keywords."""
+
+    def __init__(self, name, keywords):
+        self.name = name
+        self.keywords = keywords
+
+    def to_dict(self):
+        return {"name": self.name, "keywords": self.keywords}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["keywords"])
+
+
+def introspect_library(name, args):
+    """Import the library and return its LibraryData. Raises robot.errors.DataError if the import fails."""
+    library = TestLibrary(name, args)
+    return LibraryData(library.orig_name, [handler.name for handler in library.handlers])
+
+
+def parse_resource(path):
+    """Parse the resource file and return its ResourceData. Used by process pool workers."""
+    return Resource(path).to_data()
+
+
+def load_resource(path, cache=None, low_memory=False):
+    """Create Resource from the file, reusing cached ResourceData if the file did not change since it was cached."""
+    data = cache.get_resource(path) if cache is not None else None
+    if data is not None:
+        return Resource(path, data=data, low_memory=low_memory)
+    resource = Resource(path, low_memory=low_memory)
+    if cache is not None:
+        cache.set_resource(path, resource.to_data())
+    return resource
+
+
 class KeywordStore:
     def __init__(self, normal, embedded):
         self._normal = normal
         self._embedded = embedded
+        self._embedded_index = EmbeddedKeywordsIndex()
+        for name, (kw_stat, pattern) in embedded.items():
+            self._embedded_index.add(name, pattern, kw_stat)
 
     def __iter__(self):
         yield from self._normal.values()
         for kw_stat, pattern in self._embedded.values():
             yield kw_stat
 
+    @property
+    def normal(self):
+        return self._normal.values()
+
+    @property
+    def has_embedded(self):
+        return bool(self._embedded)
+
     def find_kw(self, kw_name):
-        found = []
         try:
-            kw_stat = self._normal[kw_name]
-            found.append(kw_stat)
+            return [self._normal[kw_name]]
         except KeyError:
-            for name, (kw_stat, template) in self._embedded.items():
-                if self.match_embedded(kw_name, template):
-                    found.append(kw_stat)
-        return found
+            return self.find_embedded(kw_name)
 
-    @staticmethod
-    def match_embedded(name, pattern):
-        raise NotImplemented
+    def find_embedded(self, kw_name):
+        if not self._embedded:
+            return []
+        return self._embedded_index.find(kw_name)
+
+    def get(self, name):
+        """Return keyword defined with exactly given name (not matched with embedded arguments) or None."""
+        if name in self._embedded:
+            return self._embedded[name][0]
+        return self._normal.get(name)
 
 
 class KeywordLibraryStore(KeywordStore):
-    def __init__(self, test_library, parent):
+    def __init__(self, keyword_names, parent):
         normal = NormalizedDict(ignore="_")
-        for kw in test_library.handlers._normal:
-            normal[kw] = KeywordStats(kw, parent=parent)
-        embedded = {handler.name: (KeywordStats(handler.name, handler)) for handler in test_library.handlers._embedded}
+        embedded = {}
+        for name in keyword_names:
+            pattern = get_embedded_pattern(name)
+            if pattern:
+                embedded[name] = (KeywordStats(name, parent=parent), pattern)
+            else:
+                normal[name] = KeywordStats(name, parent=parent)
         super().__init__(normal, embedded)
 
-    @staticmethod
-    def match_embedded(name, pattern):
-        return pattern.matches(name)
 
+class KeywordIndex:
+    """
+    Global index of keyword definitions in all mapped resources and libraries.
 
-class KeywordResourceStore(KeywordStore):
-    def __init__(self, normal, embedded, parent):
-        keyword_stats = {name: KeywordStats(name, parent) for name in normal.values()}
-        for kw_stat, pattern in embedded.values():
-            keyword_stats[kw_stat.name] = kw_stat
-        super().__init__(normal, embedded)
+    Keywords without embedded arguments are mapped by normalized name to all their definitions. Keywords with
+    embedded arguments can't be indexed by name, so files containing them are searched with their own index.
+    """
+
+    def __init__(self):
+        self.normal = defaultdict(dict)
+        self.embedded_files = []
+        self.indexed = set()
+
+    @classmethod
+    def from_files(cls, files):
+        index = cls()
+        for file in files:
+            index.add_file(file)
+        return index
 
     @staticmethod
-    def match_embedded(name, pattern):
-        return pattern.match(name)
+    def normalize(name):
+        return normalize(name, ignore="_")
+
+    def add_file(self, file):
+        """Add keywords from the file to the index. Files without keywords (not yet loaded libraries) are skipped."""
+        if not file.keywords or id(file) in self.indexed:
+            return
+        self.indexed.add(id(file))
+        for kw_stat in file.keywords.normal:
+            self.normal[self.normalize(kw_stat.name)][id(file)] = (file, kw_stat)
+        if file.keywords.has_embedded:
+            self.embedded_files.append(file)
+
+    def remove_file(self, file):
+        """Remove keywords of the file (for example after the file changed) from the index."""
+        if id(file) not in self.indexed:
+            return
+        self.indexed.discard(id(file))
+        for kw_stat in file.keywords.normal:
+            definitions = self.normal[self.normalize(kw_stat.name)]
+            definitions.pop(id(file), None)
+            if not definitions:
+                del self.normal[self.normalize(kw_stat.name)]
+        if file in self.embedded_files:
+            self.embedded_files.remove(file)
+
+    def get_definitions(self, name):
+        """Return definitions of keywords without embedded arguments as dictionary of file id: (file, keyword)."""
+        return self.normal.get(self.normalize(name), {})
+
+    def find_definitions(self, name):
+        """Return list of (file, keyword) tuples of all definitions matching the name."""
+        definitions = self.get_definitions(name)
+        found = list(definitions.values())
+        for file in self.embedded_files:
+            if id(file) not in definitions:
+                found.extend((file, kw_stat) for kw_stat in file.keywords.find_embedded(name))
+        return found
 
 
 class File:
@@ -254,12 +616,13 @@ class Library(File):
         self.loaded = False
         self.filter_not_used = False
         self.builtin = False
+        self.pending_import = None
 
     def get_type(self):
         return self.type
 
-    def load_library(self, args, scope_variables, defined_in_file):
-        if self.keywords:
+    def load_library(self, args, scope_variables, defined_in_file, cache=None, loader=None):
+        if self.keywords or self.pending_import:
             return
         error = False
         if scope_variables is not None and args:
@@ -278,15 +641,39 @@ class Library(File):
         if error:
             return
         name = str(self.path)
-        self.init_library(name, replaced_args, defined_in_file)
-
-    def init_library(self, name, replaced_args, defined_in_file):
+        self.init_library(name, replaced_args, defined_in_file, cache, loader)
+
+    def init_library(self, name, replaced_args, defined_in_file, cache=None, loader=None):
+        data = cache.get_library(name, replaced_args) if cache is not None else None
+        if data is None:
+            if loader is not None:
+                self.pending_import = (loader.submit(name, replaced_args), defined_in_file, cache)
+                return
+            try:
+                data = introspect_library(name, replaced_args)
+            except robot.errors.DataError as err:
+                self.errors.add(f"{defined_in_file}: {err}")
+                return
+            if cache is not None:
+                cache.set_library(name, replaced_args, data)
+        self.name = data.name
+        self.keywords = KeywordLibraryStore(data.keywords, name)
+
+    def wait_for_import(self):
+        """Finish loading the library if it is imported in a separate process."""
+        if self.pending_import is None:
+            return
+        library_import, defined_in_file, cache = self.pending_import
+        self.pending_import = None
         try:
-            library = TestLibrary(name, replaced_args)
-            self.name = library.orig_name
-            self.keywords = KeywordLibraryStore(library, name)
+            data = library_import.result()
         except robot.errors.DataError as err:
             self.errors.add(f"{defined_in_file}: {err}")
+            return
+        if cache is not None:
+            cache.set_library(library_import.name, library_import.args, data)
+        self.name = data.name
+        self.keywords = KeywordLibraryStore(data.keywords, library_import.name)
 
     def search(self, name):
         if not self.keywords:
@@ -295,21 +682,46 @@ class Library(File):
 
 
 class Resource(File):
-    def __init__(self, path: Path):
+    """
+    Keywords, imports and variables of the Robot Framework file.
+
+    In ``low_memory`` mode variables are stored as plain (name, value) pairs, converted to Robot Framework
+    ``Variables`` only when they are accessed.
+    """
+
+    def __init__(self, path: Path, data: Optional[ResourceData] = None, low_memory: bool = False):
         super().__init__(path)
         self.type = RESOURCE_TYPE
         self.name = path.name  # TODO Resolve chaos with names and paths
         self.directory = str(path.parent)
 
-        visitor = self.load_model_from_resource(path)
-        self.keywords = KeywordResourceStore(visitor.normal_keywords, visitor.embedded_keywords, str(path))
+        if data is None:
+            visitor = self.load_model_from_resource(path)
+        else:
+            visitor = data.to_visitor(str(path))
+        self.keywords = KeywordStore(visitor.normal_keywords, visitor.embedded_keywords)
         self.has_tests = visitor.has_tests
-        self.variables = visitor.variables
+        if low_memory:
+            self._variables = None
+            self._variable_items = tuple(
+                (name, ResourceData.plain_value(value)) for name, value in visitor.variables.as_dict().items()
+            )
+        else:
+            self._variables = visitor.variables
         self.current_variables = None
 
         self.resources = visitor.resources
         self.libraries = visitor.libraries
 
+    @property
+    def variables(self):
+        if self._variables is not None:
+            return self._variables
+        variables = Variables()
+        for name, value in self._variable_items:
+            variables[name] = value
+        return variables
+
     @staticmethod
     def load_model_from_resource(path):
         model = get_model(str(path), data_only=True, curdir=str(path.cwd()))
@@ -324,6 +736,20 @@ class Resource(File):
     def get_type(self):
         return SUITE_TYPE if self.has_tests else RESOURCE_TYPE
 
+    def to_data(self):
+        keywords = [(kw.name, kw.complexity, kw.length, kw.nesting_depth) for kw in self.keywords]
+        variables = [(name, ResourceData.plain_value(value)) for name, value in self.variables.as_dict().items()]
+        return ResourceData(keywords, self.has_tests, self.resources, self.libraries, variables)
+
+    def get_imports_fingerprint(self):
+        """
+        Return hashable key that is the same for files which resolve to the same imports - files from the same
+        directory with identical imports and variables.
+        """
+        variables = tuple(sorted((name, repr(value)) for name, value in self.variables.as_dict().items()))
+        libraries = tuple((name, tuple(args)) for name, args in self.libraries.items())
+        return self.directory, tuple(self.resources), libraries, variables
+
     def search(self, name, lib_name):
         if lib_name and lib_name != self.name_no_ext:
             return []
@@ -339,37 +765,130 @@ class Tree:
         self.children = []
 
     @classmethod
-    def from_directory(cls, path: Path, gitignore: Optional[PathSpec] = None):
+    def from_directory(
+        cls,
+        path: Path,
+        gitignore: Optional[GitIgnore] = None,
+        jobs: int = 1,
+        cache=None,
+        path_filter: Optional[PathFilter] = None,
+        reuse: Optional[Dict[str, File]] = None,
+        low_memory: bool = False,
+    ):
+        """
+        Create tree of resources and libraries from the directory.
+
+        If ``jobs`` is greater than 1, resource files are parsed in the pool of processes and the tree is assembled
+        after all files are parsed. Files that did not change since they were stored in the ``cache`` are not parsed.
+        Files and directories ignored by ``gitignore`` rules (and by .gitignore files found in the scanned
+        directories) or skipped by ``path_filter`` are not scanned. Files found in ``reuse`` dictionary
+        (path: Resource or Library) are reused instead of parsing or creating them again. With ``low_memory`` the
+        resources keep only compact data (see ``Resource``).
+        """
+        reuse = {} if reuse is None else reuse
+        if jobs <= 1:
+
+            def load(child):
+                return reuse.get(str(child)) or load_resource(child, cache, low_memory)
+
+            return cls._from_directory(path, gitignore, path_filter, reuse, load)
+
+        def submit(child):
+            if str(child) in reuse:
+                return reuse[str(child)]
+            data = cache.get_resource(child) if cache is not None else None
+            if data is not None:
+                return Resource(child, data=data, low_memory=low_memory)
+            return child, executor.submit(parse_resource, child)
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            tree = cls._from_directory(path, gitignore, path_filter, reuse, submit)
+            tree.load_parsed_resources(cache, low_memory)
+        return tree
+
+    @classmethod
+    def _from_directory(
+        cls, path: Path, gitignore: Optional[GitIgnore], path_filter: Optional[PathFilter], reuse, load_resource
+    ):
+        tree, _ = cls._walk_directory(
+            path, path.resolve(), "", gitignore or GitIgnore(), path_filter or PathFilter(), reuse, load_resource
+        )
+        return tree
+
+    @classmethod
+    def _walk_directory(
+        cls,
+        path: Path,
+        resolved_path: Path,
+        relative_path: str,
+        gitignore: GitIgnore,
+        path_filter: PathFilter,
+        reuse,
+        load_resource,
+    ):
+        """
+        Read the directory once with ``os.scandir`` and return the tree and whether the directory contains
+        ``__init__.py``. File types are taken from the directory entries and ignored directories are never read.
+        Rules of .gitignore file found in the directory are added to the ``gitignore`` rules of its parents.
+        """
         tree = cls(str(path.name))
         tree.path = path
-
-        for child in path.iterdir():
-            gitignore_pattern = f"{child}/" if child.is_dir() else str(child)
-            if gitignore is not None and gitignore.match_file(gitignore_pattern):
+        with os.scandir(path) as scanned:
+            entries = list(scanned)
+        has_init = any(entry.name == "__init__.py" for entry in entries)
+        if any(entry.name == ".gitignore" for entry in entries):
+            gitignore = gitignore.with_file(resolved_path)
+        for entry in entries:
+            if entry.name == "__init__.py":
                 continue
-            child = child.resolve()
-            if child.is_dir():
-                library_init = Library(child) if tree.has_init(child) else None
-
-                child_tree = cls.from_directory(path=child, gitignore=gitignore)
+            is_dir = entry.is_dir()
+            if gitignore.is_ignored(entry.name, is_dir):
+                continue
+            relative_child = f"{relative_path}{entry.name}"
+            if path_filter.skip_directory(relative_child) if is_dir else path_filter.skip_file(relative_child):
+                continue
+            resolved_child = (path / entry.name).resolve() if entry.is_symlink() else resolved_path / entry.name
+            if is_dir:
+                child_tree, child_has_init = cls._walk_directory(
+                    resolved_child,
+                    resolved_child,
+                    f"{relative_child}/",
+                    gitignore.descend(entry.name),
+                    path_filter,
+                    reuse,
+                    load_resource,
+                )
+                if child_has_init and not path_filter.skip_file(f"{relative_child}/__init__.py"):
+                    library_init = reuse.get(str(resolved_child)) or Library(resolved_child)
+                else:
+                    library_init = None
                 if child_tree.children:  # if the directory is empty (no libraries or resources) skip it
                     if library_init:
                         child_tree.children.append(library_init)
                     tree.children.append(child_tree)
                 elif library_init:
                     tree.children.append(library_init)
-            elif child.is_file():
-                if child.suffix not in INCLUDE_EXT or child.name == "__init__.py":
+            elif entry.is_file():
+                suffix = os.path.splitext(entry.name)[1]
+                if suffix not in INCLUDE_EXT:
                     continue
-                if child.suffix == ".py":  # TODO better mapping
-                    tree.children.append(Library(child))
+                if suffix == ".py":  # TODO better mapping
+                    tree.children.append(reuse.get(str(resolved_child)) or Library(resolved_child))
                 else:
-                    tree.children.append(Resource(child))
-        return tree
-
-    @staticmethod
-    def has_init(directory):
-        return any(child.name == "__init__.py" for child in directory.iterdir())  # FIXME
+                    tree.children.append(load_resource(resolved_child))
+        return tree, has_init
+
+    def load_parsed_resources(self, cache=None, low_memory=False):
+        """Replace (path, future) placeholders of resources parsed in separate processes with Resource objects."""
+        for index, child in enumerate(self.children):
+            if isinstance(child, tuple):
+                path, future = child
+                data = future.result()
+                if cache is not None:
+                    cache.set_resource(path, data)
+                self.children[index] = Resource(path, data=data, low_memory=low_memory)
+            elif child.type == DIRECTORY_TYPE:
+                child.load_parsed_resources(cache, low_memory)
 
     def get_type(self):
         return self.type
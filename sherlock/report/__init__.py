@@ -6,9 +6,15 @@ import sherlock.exceptions
 
 
 class Report:
+    variance_threshold = None  # coefficient of variation above which keywords are flagged in the report
+
     def get_report(self, tree, tree_name, path_root):
         raise NotImplementedError
 
+    def configure(self, param, value):
+        """Set the parameter of the report from ``--configure report:param:value`` option."""
+        raise sherlock.exceptions.ConfigGeneralError(f"Report '{self.name}' does not have '{param}' parameter")
+
 
 def _import_module_from_file(file_path):
     """Import Python file as module.
@@ -50,9 +56,10 @@ def load_reports():
     return reports
 
 
-def get_reports(configured_reports):
+def get_reports(configured_reports, configure=None, variance_threshold=None):
     """
     Returns dictionary with list of valid, enabled reports (listed in `configured_reports` set of str).
+    Reports are configured with `configure` list of "report:param:value" strings.
     """
     reports = load_reports()
     enabled_reports = {}
@@ -61,4 +68,16 @@ def get_reports(configured_reports):
             raise sherlock.exceptions.InvalidReportName(report, reports)
         elif report not in enabled_reports:
             enabled_reports[report] = reports[report]
+    for config in configure or []:
+        try:
+            report, param, value = config.split(":", maxsplit=2)
+        except ValueError:
+            raise sherlock.exceptions.ConfigGeneralError(
+                f"Invalid report configuration '{config}'. Expected format: report:param:value"
+            ) from None
+        if report not in reports:
+            raise sherlock.exceptions.InvalidReportName(report, reports)
+        reports[report].configure(param, value)
+    for report in enabled_reports.values():
+        report.variance_threshold = variance_threshold
     return enabled_reports
@@ -0,0 +1,83 @@
+import heapq
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+import sherlock.report
+from sherlock.exceptions import ConfigGeneralError
+
+METRICS = {
+    "total_time": lambda kw: kw.timings.total_ms,
+    "self_time": lambda kw: kw.timings.self_total_ms,
+    "p99": lambda kw: kw.timings.percentile(99) or 0,
+    "executions": lambda kw: kw.used,
+    "complexity_executions": lambda kw: (kw.complexity or 0) * kw.used,
+}
+
+
+def iter_keywords(tree):
+    for path, file in tree.get_resources():
+        for kw in file.keywords or ():
+            yield path, kw
+
+
+def get_hotspots(tree, metric, top):
+    """Return ``top`` (metric value, file path, keyword) tuples with the highest non-zero metric value."""
+    key = METRICS[metric]
+    candidates = ((key(kw), path, kw) for path, kw in iter_keywords(tree))
+    return heapq.nlargest(top, (candidate for candidate in candidates if candidate[0]), key=lambda c: c[0])
+
+
+class HotspotsReport(sherlock.report.Report):
+    name: str = "hotspots"
+    description: str = "Top keywords by total time, self time, p99 time, executions or complexity x executions"
+
+    def __init__(self):
+        self.top = 20
+        self.rank_by = "total_time"
+
+    def configure(self, param, value):
+        if param == "top":
+            if not value.isdigit() or int(value) < 1:
+                raise ConfigGeneralError(
+                    f"Invalid value '{value}' of hotspots report 'top' parameter. Use positive integer"
+                )
+            self.top = int(value)
+        elif param == "rank_by":
+            if value not in METRICS:
+                raise ConfigGeneralError(
+                    f"Invalid value '{value}' of hotspots report 'rank_by' parameter. Use one of: {', '.join(METRICS)}"
+                )
+            self.rank_by = value
+        else:
+            super().configure(param, value)
+
+    def get_report(self, tree, tree_name, path_root):
+        table = Table(title=f"Top {self.top} keywords in {escape(tree_name)} by {self.rank_by.replace('_', ' ')}")
+        for column in (
+            "#",
+            "Keyword",
+            "Source",
+            "Executions",
+            "Complexity",
+            "Total time [s]",
+            "Self time [s]",
+            "p99 [s]",
+        ):
+            table.add_column(column)
+        for rank, (_, path, kw) in enumerate(get_hotspots(tree, self.rank_by, self.top), start=1):
+            high_variance = kw.timings.has_high_variance(self.variance_threshold)
+            table.add_row(
+                str(rank),
+                f"[bold yellow]{escape(kw.name)}" if high_variance else escape(kw.name),
+                escape(path),
+                str(kw.used),
+                "" if kw.complexity is None else str(kw.complexity),
+                kw.timings.total,
+                kw.timings.self_total,
+                kw.timings.p99,
+            )
+        console = Console()
+        console.print()
+        console.print(table)
@@ -9,18 +9,25 @@ from sherlock.model import DIRECTORY_TYPE, LIBRARY_TYPE, RESOURCE_TYPE, SUITE_TY
 
 
 class KeywordResult:
-    def __init__(self, element_id, name, used, complexity, status, timings):
+    def __init__(self, element_id, name, used, complexity, status, timings, high_variance=False):
         self.element_id = element_id
         self.name = name
         self.used = used
         self.complexity = complexity
         self.status = status
         self.timings = timings
+        self.high_variance = high_variance
+
+    @property
+    def variation(self):
+        variation = self.timings.coefficient_of_variation
+        return "" if variation is None else f"{variation:.2f}"
 
 
 class HtmlResultModel:
-    def __init__(self, element_id, model):
+    def __init__(self, element_id, model, variance_threshold=None):
         self.element_id = element_id
+        self.variance_threshold = variance_threshold
         self.type = model.get_type().upper()
         self.name = model.name
         self.path = model.path
@@ -60,6 +67,7 @@ class HtmlResultModel:
                     complexity=kw.complexity,
                     status=kw.status,
                     timings=kw.timings,
+                    high_variance=kw.timings.has_high_variance(self.variance_threshold),
                 )
             )
 
@@ -77,7 +85,7 @@ class HtmlResultModel:
             return
         for index, child in enumerate(self.get_children_with_init_first(model)):
             new_id = f"{self.element_id}-r{index}"
-            model = HtmlResultModel(new_id, child)
+            model = HtmlResultModel(new_id, child, self.variance_threshold)
             self.timings += model.timings
             self.children.append(model)
 
@@ -87,7 +95,7 @@ class HTMLReport(sherlock.report.Report):
     description: str = "HTML report"
 
     def get_report(self, directory, name, output_dir):
-        result = HtmlResultModel("d0", directory)
+        result = HtmlResultModel("d0", directory, self.variance_threshold)
         with open(Path(__file__).parent / "html.template") as f:
             template = Template(f.read()).render(tree=[result])
         with open(output_dir / f"sherlock_{name}.html", "w") as f:
@@ -1,21 +1,32 @@
 import json
 
 import sherlock.report
-from sherlock.model import DIRECTORY_TYPE
+from sherlock.model import DIRECTORY_TYPE, KeywordTimings
 
 
-def directory_to_json(directory):
+def directory_to_json(directory, variance_threshold=None):
     ret = {"name": str(directory.name), "type": directory.type}
     if directory.type == DIRECTORY_TYPE:  # TODO Directory can have keywords (__init__.py)
-        ret["children"] = [directory_to_json(resource) for resource in directory.children]
+        ret["children"] = [directory_to_json(resource, variance_threshold) for resource in directory.children]
     else:
         if directory.keywords is None:
             ret["keywords"] = []
         else:
             ret["keywords"] = [
-                {"name": kw.name, "used": kw.used, "complexity": kw.complexity, "status": "pass"}  # TODO
+                {
+                    "name": kw.name,
+                    "used": kw.used,
+                    "complexity": kw.complexity,
+                    "status": "pass",  # TODO
+                    "percentiles": kw.timings.percentiles(),
+                    "stddev": kw.timings.stddev_ms,
+                    "coefficient_of_variation": kw.timings.coefficient_of_variation,
+                    "high_variance": kw.timings.has_high_variance(variance_threshold),
+                }
                 for kw in directory.keywords
             ]
+            timings = sum((kw.timings for kw in directory.keywords if kw.used), KeywordTimings())
+            ret["percentiles"] = timings.percentiles()
     return ret
 
 
@@ -24,6 +35,6 @@ class JsonReport(sherlock.report.Report):
     description: str = "JSON report"
 
     def get_report(self, tree, tree_name, path_root):
-        ret = directory_to_json(tree)
+        ret = directory_to_json(tree, self.variance_threshold)
         with open(path_root / f"sherlock_{tree_name}.json", "w") as f:
             json.dump(ret, f, indent=4)
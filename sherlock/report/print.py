@@ -5,40 +5,77 @@ from rich.text import Text
 from rich.tree import Tree
 
 import sherlock.report
+from sherlock.exceptions import ConfigGeneralError
 from sherlock.model import DIRECTORY_TYPE, KeywordTimings
 
+SORT_KEYS = {
+    "name": lambda kw: kw.name,
+    "used": lambda kw: -kw.used,
+    "complexity": lambda kw: -(kw.complexity or 0),
+    "total_time": lambda kw: -kw.timings.total_ms,
+    "self_time": lambda kw: -kw.timings.self_total_ms,
+}
+
 
 def timings_to_table(timings):
     timings_table = Table(title="Elapsed time")
-    for col in ["Total elapsed [s]", "Shortest execution [s]", "Longest execution [s]", "Average execution [s]"]:
+    columns = [
+        ("Total elapsed [s]", timings.total),
+        ("Self time [s]", timings.self_total),
+        ("Shortest execution [s]", timings.min),
+        ("Longest execution [s]", timings.max),
+        ("Average execution [s]", timings.avg),
+        ("Std deviation [s]", timings.stddev),
+        ("p50 [s]", timings.p50),
+        ("p90 [s]", timings.p90),
+        ("p99 [s]", timings.p99),
+    ]
+    for col, _ in columns:
         timings_table.add_column(col)
-    timings_table.add_row(timings.total, timings.min, timings.max, timings.avg)
+    timings_table.add_row(*(value for _, value in columns))
     return timings_table
 
 
-def keywords_to_table(keywords):
+def format_variation(timings):
+    variation = timings.coefficient_of_variation
+    return "" if variation is None else f"{variation:.2f}"
+
+
+def keywords_to_table(keywords, variance_threshold=None):
     has_complexity = any(kw.complexity for kw in keywords)
-    table = Table(title="Keywords:")
+    high_variance = {id(kw) for kw in keywords if kw.timings.has_high_variance(variance_threshold)}
+    caption = "[yellow]Yellow[/] keywords have high variance of execution times" if high_variance else None
+    table = Table(title="Keywords:", caption=caption)
     table.add_column("Name", justify="left", no_wrap=True)
     table.add_column("Executions")
     if has_complexity:
         table.add_column("Complexity")
     table.add_column("Average time [s]")
     table.add_column("Total time [s]")
+    table.add_column("Self time [s]")
+    for percentile in ("p50", "p90", "p99"):
+        table.add_column(f"{percentile} [s]")
+    table.add_column("Std dev [s]")
+    table.add_column("CV")
     for kw in keywords:
-        name = kw.name if kw.used else f"[cyan]{kw.name}"
+        if id(kw) in high_variance:
+            name = f"[bold yellow]{kw.name}"
+        else:
+            name = kw.name if kw.used else f"[cyan]{kw.name}"
         row = [name, str(kw.used)]
         if has_complexity:
             row.append(str(kw.complexity))
         if kw.used:
-            row.extend([str(kw.timings.avg), str(kw.timings.total)])
+            timings = kw.timings
+            row.extend([timings.avg, timings.total, timings.self_total, timings.p50, timings.p90, timings.p99])
+            row.extend([timings.stddev, format_variation(timings)])
         else:
-            row.extend(["", ""])
+            row.extend(["", "", "", "", "", "", "", ""])
         table.add_row(*row)
     return table
 
 
-def log_directory(directory, tree):
+def log_directory(directory, tree, sort_key=None, variance_threshold=None):
     for resource in directory.children:
         if resource.type == DIRECTORY_TYPE:
             style = "dim" if resource.name.startswith("__") else ""
@@ -47,14 +84,16 @@ def log_directory(directory, tree):
                 style=style,
                 guide_style=style,
             )
-            log_directory(resource, branch)
+            log_directory(resource, branch, sort_key, variance_threshold)
         else:
             text = Text(str(resource))
             keywords = [kw for kw in resource.keywords]
+            if sort_key is not None:
+                keywords.sort(key=sort_key)
             if keywords:
                 timings = sum((kw.timings for kw in keywords if kw.used), KeywordTimings())
                 timings_table = timings_to_table(timings)
-                keywords_table = keywords_to_table(keywords)
+                keywords_table = keywords_to_table(keywords, variance_threshold)
 
                 tree.add(Group(text, timings_table, keywords_table))
             else:
@@ -65,12 +104,24 @@ class PrintReport(sherlock.report.Report):
     name: str = "print"
     description: str = "Simple printed report"
 
+    def __init__(self):
+        self.sort_by = None
+
+    def configure(self, param, value):
+        if param != "sort_by":
+            return super().configure(param, value)
+        if value not in SORT_KEYS:
+            raise ConfigGeneralError(
+                f"Invalid value '{value}' of print report 'sort_by' parameter. Use one of: {', '.join(SORT_KEYS)}"
+            )
+        self.sort_by = value
+
     def get_report(self, directory, tree_name, path_root):
         tree = Tree(
             f"[link file://{directory}]{directory}",
             guide_style="bold bright_blue",
         )
-        log_directory(directory, tree)
+        log_directory(directory, tree, SORT_KEYS.get(self.sort_by), self.variance_threshold)
         console = Console()
         console.print()
         console.print(tree)
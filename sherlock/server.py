@@ -0,0 +1,155 @@
+"""
+Analysis server answering queries over a Unix socket.
+
+The server maps the source once and keeps resources, imported libraries and the keyword index in memory, so queries
+do not pay for starting Python, importing Robot Framework, walking the source and importing libraries again.
+
+The protocol is JSON lines: every request is a JSON object in a single line and the server answers with a single line
+JSON object ``{"status": "ok", "result": ...}`` or ``{"status": "error", "message": ...}``. Supported requests:
+
+- ``{"command": "analyze", "output": "path/to/output.xml"}`` - analyse the output file (replaces the previous usage),
+- ``{"command": "usage", "keyword": "name"}`` - usage of all definitions matching the keyword name,
+- ``{"command": "unused", "file": "path/to/file.resource"}`` - names of keywords not used in the file,
+- ``{"command": "refresh", "paths": ["path", ...]}`` - parse changed files again and repeat the last analysis,
+- ``{"command": "shutdown"}`` - stop the server.
+"""
+import json
+import os
+import socketserver
+import stat
+from pathlib import Path
+
+from sherlock.exceptions import SherlockFatalError
+from sherlock.streaming import summarize_output
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.handle_line(line)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if self.server.stopped:
+                break
+
+
+class SherlockServer(getattr(socketserver, "UnixStreamServer", object)):
+    def __init__(self, socket_path, sherlock):
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise SherlockFatalError("Server mode requires Unix sockets which are not supported on this platform")
+        self.socket_path = Path(socket_path)
+        self.sherlock = sherlock
+        # queries analyse outputs sent by clients and files edited since the start, which must not be stored in the
+        # snapshot of the committed code
+        self.sherlock.incremental = None
+        self.stopped = False
+        self.summaries = None
+        self.commands = {
+            "analyze": self.analyze,
+            "usage": self.usage,
+            "unused": self.unused,
+            "refresh": self.refresh,
+            "shutdown": self.shutdown_server,
+        }
+        self.remove_stale_socket()
+        super().__init__(str(self.socket_path), RequestHandler)
+
+    def remove_stale_socket(self):
+        try:
+            mode = os.stat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise SherlockFatalError(f"Can't create server socket, file already exists: '{self.socket_path}'")
+        self.socket_path.unlink()
+
+    def serve(self):
+        """Handle requests until the shutdown request."""
+        try:
+            while not self.stopped:
+                self.handle_request()
+        finally:
+            self.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+    def handle_line(self, line):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise SherlockFatalError("Request must be a JSON object")
+            command = request.get("command")
+            if command not in self.commands:
+                raise SherlockFatalError(
+                    f"Unknown command '{command}'. Available commands: {', '.join(sorted(self.commands))}"
+                )
+            return {"status": "ok", "result": self.commands[command](request)}
+        except ValueError as err:  # also SherlockFatalError
+            return {"status": "error", "message": str(err)}
+        except Exception as err:  # the server should survive unexpected errors in single request
+            return {"status": "error", "message": f"{type(err).__name__}: {err}"}
+
+    @staticmethod
+    def get_argument(request, name):
+        if name not in request:
+            raise SherlockFatalError(f"Command '{request['command']}' requires '{name}' argument")
+        return request[name]
+
+    def analyze(self, request):
+        output = Path(self.get_argument(request, "output"))
+        if not output.is_file():
+            raise SherlockFatalError(f"Reading Robot Framework output file failed. No such file: '{output}'")
+        self.summaries = [summarize_output(output)]
+        return self.apply_summaries()
+
+    def apply_summaries(self):
+        self.sherlock.reset_usage()
+        return self.get_analysis_result(self.sherlock.analyse(self.summaries, None))
+
+    def get_analysis_result(self, errors):
+        keywords = [kw_stat for file in self.sherlock.resources.values() for kw_stat in file.keywords]
+        used = sum(1 for kw_stat in keywords if kw_stat.used)
+        return {"used": used, "unused": len(keywords) - used, "errors": errors}
+
+    def usage(self, request):
+        name = self.get_argument(request, "keyword")
+        return [
+            {
+                "name": kw_stat.name,
+                "source": str(file.path),
+                "used": kw_stat.used,
+                "timings": kw_stat.timings.to_dict(),
+            }
+            for file, kw_stat in self.sherlock.keyword_index.find_definitions(name)
+        ]
+
+    def unused(self, request):
+        path = self.get_argument(request, "file")
+        file = self.sherlock.resources.get(path) or self.sherlock.resources.get(str(Path(path).resolve()))
+        if file is None:
+            raise SherlockFatalError(f"File '{path}' is not mapped by Sherlock")
+        return [kw_stat.name for kw_stat in file.keywords if not kw_stat.used]
+
+    def refresh(self, request):
+        paths = {str(Path(path).resolve()) for path in self.get_argument(request, "paths")}
+        self.sherlock.remap_packages(paths)
+        if self.summaries is not None:
+            return self.apply_summaries()
+        self.sherlock.reset_usage()
+        return self.get_analysis_result(self.sherlock.analyse(*self.sherlock.load_results()))
+
+    def shutdown_server(self, request):
+        self.stopped = True
+        return None
+
+
+def serve(sherlock, socket_path):
+    """Analyse the source and serve queries about it on the Unix socket until the shutdown request."""
+    sherlock.run()
+    server = SherlockServer(socket_path, sherlock)
+    sherlock.log(f"Listening on {socket_path}")
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,226 @@
+"""
+Incremental reading of Robot Framework output files.
+
+``ExecutionResult`` builds the complete result model in memory which is not feasible for very large output files.
+Functions in this module parse the output with ``iterparse`` and drop every element as soon as it was processed, so
+the memory usage does not depend on the size of the output file.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree.ElementTree import iterparse
+
+from robot.api import SuiteVisitor
+from robot.utils import get_elapsed_time
+
+from sherlock.model import KeywordTimings
+
+SUITE_START = "suite_start"
+SUITE_END = "suite_end"
+KEYWORD_START = "keyword_start"
+KEYWORD_END = "keyword_end"
+TEARDOWN = "TEARDOWN"
+
+
+def get_elapsed_milliseconds(status):
+    if status is None:
+        return 0
+    elapsed = status.get("elapsed")  # Robot Framework 7+
+    if elapsed is not None:
+        return round(float(elapsed) * 1000)
+    return get_elapsed_time(status.get("starttime"), status.get("endtime"))
+
+
+def get_self_elapsed(elapsed, called):
+    """
+    Return self time of the keyword that ended, given ``called`` stack with elapsed time of keywords called by the
+    keywords that did not end yet. The keyword is removed from the stack and its time is added to its parent.
+    """
+    self_elapsed = max(0, elapsed - called.pop())
+    if called:
+        called[-1] += elapsed
+    return self_elapsed
+
+
+def iter_output(path):
+    """
+    Yield ``(event, data)`` tuples for suites and keywords found in the output file:
+
+    - ``SUITE_START`` with suite source,
+    - ``SUITE_END`` with None,
+    - ``KEYWORD_START`` with tuple of keyword name, library name and keyword type,
+    - ``KEYWORD_END`` with elapsed time in milliseconds.
+
+    Control structures (FOR, IF, TRY..) are transparent - keywords inside them are reported as children
+    of the closest keyword, test or suite.
+    """
+    stack = []
+    for event, elem in iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == "suite":
+                yield SUITE_START, elem.get("source")
+            elif elem.tag == "kw":
+                yield KEYWORD_START, (elem.get("name"), elem.get("owner", elem.get("library")), elem.get("type"))
+            continue
+        stack.pop()
+        if elem.tag == "suite":
+            yield SUITE_END, None
+        elif elem.tag == "kw":
+            yield KEYWORD_END, get_elapsed_milliseconds(elem.find("status"))
+        # status is read when its parent ends, everything else can be released immediately
+        if elem.tag != "status" and stack:
+            stack[-1].remove(elem)
+
+
+def visit_output(path, visitor):
+    """
+    Feed keyword executions from the output file to ``StructureVisitor``.
+
+    It follows the same rules as visiting the result model: the body of the keyword is only analysed if the keyword
+    definition was found, but keyword teardown is always analysed.
+    """
+    suite_contexts = []
+    keywords = []  # stack of (keyword definition or None, is visited)
+    called = []  # stack of elapsed time of keywords called by the keywords in the stack
+    for event, data in iter_output(path):
+        if event == KEYWORD_START:
+            name, lib_name, kw_type = data
+            visited = True
+            if keywords:
+                parent, parent_visited = keywords[-1]
+                visited = parent_visited and (parent is not None or kw_type == TEARDOWN)
+            kw_stat = visitor.find_keyword(name, lib_name) if visited else None
+            if kw_stat is not None:
+                kw_stat.used += 1
+            keywords.append((kw_stat, visited))
+            called.append(0)
+        elif event == KEYWORD_END:
+            kw_stat, _ = keywords.pop()
+            self_elapsed = get_self_elapsed(data, called)
+            if kw_stat is not None:
+                kw_stat.timings.add_timing(data, self_elapsed)
+        elif event == SUITE_START:
+            suite_contexts.append(visitor.get_suite_context())
+            visitor.set_suite_context(data)
+        elif event == SUITE_END:
+            visitor.restore_suite_context(suite_contexts.pop())
+
+
+class KeywordCalls:
+    """Executions of the keyword aggregated by the call path (suite, parent keywords) in the output file."""
+
+    def __init__(self, name=None, lib_name=None, kw_type=None):
+        self.name = name
+        self.lib_name = lib_name
+        self.kw_type = kw_type
+        self.used = 0
+        self.timings = KeywordTimings()
+        self.children = {}
+
+    def get_child(self, name, lib_name, kw_type):
+        key = (name, lib_name, kw_type)
+        if key not in self.children:
+            self.children[key] = KeywordCalls(name, lib_name, kw_type)
+        return self.children[key]
+
+    def merge(self, other):
+        """
+        Add executions of the same call path from other summary (for example from another output file). The other
+        summary is not modified nor shared, so the summaries can be merged in any order and applied again.
+        """
+        self.used += other.used
+        self.timings.merge(other.timings)
+        for key, calls in other.children.items():
+            if key not in self.children:
+                self.children[key] = KeywordCalls(*key)
+            self.children[key].merge(calls)
+
+
+def summarize_output(path):
+    """
+    Read output file and return list of ``(suite source, KeywordCalls)`` tuples in the order of suites in the file.
+
+    Keywords are aggregated by their call path, so the summary is compact and can be sent between processes.
+    Resolving keyword definitions is left for ``apply_summary``.
+    """
+    summary = []
+    suites = []
+    keywords = []
+    called = []
+    for event, data in iter_output(path):
+        if event == KEYWORD_START:
+            parent = keywords[-1] if keywords else suites[-1]
+            calls = parent.get_child(*data)
+            calls.used += 1
+            keywords.append(calls)
+            called.append(0)
+        elif event == KEYWORD_END:
+            keywords.pop().timings.add_timing(data, get_self_elapsed(data, called))
+        elif event == SUITE_START:
+            suite_calls = KeywordCalls()
+            summary.append((data, suite_calls))
+            suites.append(suite_calls)
+        elif event == SUITE_END:
+            suites.pop()
+    return summary
+
+
+class SuiteSummary(SuiteVisitor):
+    """Collect keyword calls from the suite model (without executions) in the same format as ``summarize_output``."""
+
+    def __init__(self):
+        self.summary = []
+        self.suites = []
+
+    def visit_suite(self, suite):
+        suite_calls = KeywordCalls()
+        self.summary.append((suite.source, suite_calls))
+        self.suites.append(suite_calls)
+        suite.setup.visit(self)
+        suite.tests.visit(self)
+        suite.teardown.visit(self)
+        self.suites.pop()
+        suite.suites.visit(self)
+
+    def visit_keyword(self, kw):
+        self.suites[-1].get_child(kw.name, None, kw.type).used += 1
+
+
+def summarize_suite(suite):
+    """Return list of ``(suite source, KeywordCalls)`` tuples with keywords called in the suite model."""
+    summary = SuiteSummary()
+    suite.visit(summary)
+    return summary.summary
+
+
+def summarize_outputs(paths, jobs=None):
+    """Summarize output files (for example pabot shards) in parallel processes."""
+    workers = min(len(paths), jobs or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(summarize_output, paths))
+
+
+def apply_summary(summary, visitor):
+    """Resolve keywords from the output summary and add their executions to the matching definitions."""
+    for source, suite_calls in summary:
+        visitor.set_suite_context(source)
+        apply_calls(suite_calls, visitor)
+
+
+def apply_calls(parent, visitor, only_teardowns=False, usage=None):
+    """
+    Resolve keywords called from ``parent`` in the current suite context of the visitor and add their executions.
+    If ``usage`` list is given, ``(keyword definition, KeywordCalls)`` tuples of resolved keywords are appended to it.
+    """
+    for calls in parent.children.values():
+        if only_teardowns and calls.kw_type != TEARDOWN:
+            continue
+        kw_stat = visitor.find_keyword(calls.name, calls.lib_name)
+        if kw_stat is None:
+            apply_calls(calls, visitor, only_teardowns=True, usage=usage)
+            continue
+        kw_stat.used += calls.used
+        kw_stat.timings.merge(calls.timings)
+        if usage is not None:
+            usage.append((kw_stat, calls))
+        apply_calls(calls, visitor, usage=usage)
@@ -5,11 +5,12 @@ from pathlib import Path
 import robot.errors
 from robot.api import SuiteVisitor
 from robot.errors import DataError
+from robot.result import Keyword as ResultKeyword
 from robot.utils import find_file
 from robot.variables.scopes import VariableScopes
 from robot.variables.variables import Variables
 
-from sherlock.model import LIBRARY_TYPE
+from sherlock.model import LIBRARY_TYPE, KeywordIndex
 
 
 def _normalize_library_path(library):
@@ -33,14 +34,38 @@ def _is_library_by_path(path):
     return path.lower().endswith((".py", "/", os.sep))
 
 
+def _iter_called_keywords(body):
+    """Yield keywords called directly from the body, also from inside control structures (FOR, IF, TRY..)."""
+    for item in body:
+        if isinstance(item, ResultKeyword):
+            yield item
+        elif hasattr(item, "body"):
+            yield from _iter_called_keywords(item.body)
+
+
+def get_self_elapsed(kw):
+    """Return elapsed time of the result keyword without the time of keywords called by it (also in teardown)."""
+    called = sum(child.elapsedtime for child in _iter_called_keywords(getattr(kw, "body", ())))
+    if getattr(kw, "teardown", None):
+        called += kw.teardown.elapsedtime
+    return max(0, kw.elapsedtime - called)
+
+
 class StructureVisitor(SuiteVisitor):
-    def __init__(self, resources, from_output, robot_settings):
+    def __init__(self, resources, from_output, robot_settings, keyword_index=None, cache=None, library_loader=None):
         self.resources = resources
+        self.cache = cache
+        self.library_loader = library_loader
+        self.keyword_index = KeywordIndex.from_files(resources.values()) if keyword_index is None else keyword_index
         self.from_output = from_output
         self.variables = VariableScopes(robot_settings)
         self.suite_resource = None
         self.imported_resources = OrderedDict()
         self.imported_libraries = OrderedDict()
+        self.search_cache = {}
+        self.search_cache_context = None
+        self.import_closures = {}
+        self.pending_libraries = []
 
         self.suite_errors = set()
         self.errors = []
@@ -76,23 +101,13 @@ class StructureVisitor(SuiteVisitor):
             if library is None:
                 continue
             if library in self.resources:
-                self.resources[library].load_library(args, current_variables, resource.path)
-                lib_name = alias or self.resources[library].name
-                self.imported_libraries[lib_name] = self.resources[library]
+                self.resources[library].load_library(
+                    args, current_variables, resource.path, self.cache, self.library_loader
+                )
+                self.pending_libraries.append((alias, self.resources[library]))
 
     def visit_suite(self, suite):
-        self.imported_resources = OrderedDict()
-        self.imported_libraries = OrderedDict()
-        if str(suite.source) in self.resources:
-            suite_resource = self.resources[str(suite.source)]
-        elif Path(suite.source).is_dir() and str(Path(suite.source) / "__init__.robot") in self.resources:
-            suite_resource = self.resources[str(Path(suite.source) / "__init__.robot")]
-        else:
-            suite_resource = ""
-            # raise SherlockFatalError(f"Could not find definition of '{suite.source}' suite")  # TODO
-        if suite_resource:
-            self.suite_resource = suite_resource
-            self.init_imports(suite_resource)
+        self.set_suite_context(suite.source)
         suite.setup.visit(self)
         suite.tests.visit(self)
 
@@ -104,38 +119,117 @@ class StructureVisitor(SuiteVisitor):
         suite.teardown.visit(self)
         suite.suites.visit(self)
 
+    def set_suite_context(self, source):
+        """Resolve imports of the suite with given source and use them for searching keywords definitions."""
+        self.imported_resources = OrderedDict()
+        self.imported_libraries = OrderedDict()
+        if str(source) in self.resources:
+            suite_resource = self.resources[str(source)]
+        elif source and Path(source).is_dir() and str(Path(source) / "__init__.robot") in self.resources:
+            suite_resource = self.resources[str(Path(source) / "__init__.robot")]
+        else:
+            suite_resource = ""
+            # raise SherlockFatalError(f"Could not find definition of '{suite.source}' suite")  # TODO
+        if suite_resource:
+            self.suite_resource = suite_resource
+            self.load_import_closure(suite_resource)
+        self.invalidate_search_cache()
+
+    def load_import_closure(self, suite_resource):
+        """Resolve imports of the suite, reusing the imports of the already visited suite with the same fingerprint."""
+        fingerprint = suite_resource.get_imports_fingerprint()
+        if fingerprint in self.import_closures:
+            self.imported_resources, self.imported_libraries = self.import_closures[fingerprint]
+            return
+        self.pending_libraries = []
+        self.init_imports(suite_resource)
+        for alias, library in self.pending_libraries:
+            library.wait_for_import()
+            self.keyword_index.add_file(library)
+            self.imported_libraries[alias or library.name] = library
+        self.pending_libraries = []
+        self.import_closures[fingerprint] = (self.imported_resources, self.imported_libraries)
+
+    def get_suite_context(self):
+        return self.suite_resource, self.imported_resources, self.imported_libraries
+
+    def restore_suite_context(self, context):
+        self.suite_resource, self.imported_resources, self.imported_libraries = context
+        self.invalidate_search_cache()
+
+    def get_import_context(self):
+        """Return hashable key identifying where keywords are searched for in the current suite."""
+        return (
+            self.suite_resource.path if self.suite_resource else None,
+            tuple(self.imported_resources),
+            tuple((name, library.path, bool(library.keywords)) for name, library in self.imported_libraries.items()),
+        )
+
+    def invalidate_search_cache(self):
+        """Clear resolved keywords if the imports are different than the ones used to fill the cache."""
+        context = self.get_import_context()
+        if context != self.search_cache_context:
+            self.search_cache = {}
+            self.search_cache_context = context
+
     def visit_keyword(self, kw):
         name = kw.kwname if self.from_output else kw.name
         lib_name = kw.libname if self.from_output else None
-        found = self.search_def(name, lib_name)
-        if not found:
-            self.suite_errors.add(f"Keyword '{name}' definition not found")
-        elif len(found) > 1:
-            s = f"Keyword '{name}' matches following resources/libraries:\n"
-            self.suite_errors.add(s)
-        else:
-            found[0].used += 1
+        kw_stat = self.find_keyword(name, lib_name)
+        if kw_stat is not None:
+            kw_stat.used += 1
             if self.from_output:
-                found[0].timings.add_timing(kw.elapsedtime)
+                kw_stat.timings.add_timing(kw.elapsedtime, get_self_elapsed(kw))
             if hasattr(kw, "body"):
                 kw.body.visit(self)
         if getattr(kw, "teardown", None):
             kw.teardown.visit(self)
 
+    def find_keyword(self, name, lib_name):
+        """Return definition of the keyword or None if it was not found or the name is ambiguous."""
+        found = self.search_def(name, lib_name)
+        if not found:
+            self.suite_errors.add(f"Keyword '{name}' definition not found")
+            return None
+        if len(found) > 1:
+            s = f"Keyword '{name}' matches following resources/libraries:\n"
+            self.suite_errors.add(s)
+            return None
+        return found[0]
+
     def search_def(self, kw_name, lib_name):
+        # keyword names are case-insensitive both for normal and embedded keywords
+        key = (kw_name.lower() if kw_name else kw_name, lib_name)
+        if key not in self.search_cache:
+            self.search_cache[key] = self._search_def(kw_name, lib_name)
+        return self.search_cache[key]
+
+    def _search_def(self, kw_name, lib_name):
+        definitions = self.keyword_index.get_definitions(kw_name)
         found = []
         if self.suite_resource:
-            found += self.suite_resource.search(kw_name, lib_name)
+            found += self.search_file(self.suite_resource, definitions, kw_name, lib_name)
         if found:
             return found
         for res_name, resource in self.imported_resources.items():
-            found += resource.search(kw_name, lib_name)
+            found += self.search_file(resource, definitions, kw_name, lib_name)
         if found:
             return found
         for lib_name_or_alias, library in self.imported_libraries.items():
             if lib_name and lib_name != lib_name_or_alias:
                 continue
-            found += library.search(kw_name)
+            found += self.search_file(library, definitions, kw_name)
         if not found:
-            return self.resources["BuiltIn"].search(kw_name)
+            return self.search_file(self.resources["BuiltIn"], definitions, kw_name)
         return found
+
+    @staticmethod
+    def search_file(file, definitions, kw_name, lib_name=None):
+        """Search keyword in the file using definitions from the global keyword index."""
+        if lib_name and lib_name != file.name_no_ext:
+            return []
+        if id(file) in definitions:
+            return [definitions[id(file)][1]]
+        if not file.keywords:
+            return []
+        return file.keywords.find_embedded(kw_name)
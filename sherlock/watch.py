@@ -0,0 +1,212 @@
+"""
+Watching source files and analysing them again after they change.
+
+On Linux the changes are read from inotify. If inotify is not available (or the limit of watches is reached) the
+watched directories are polled for changed modification times instead.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from sherlock.file_utils import INCLUDE_EXT
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+SKIPPED_DIRS = frozenset({"__pycache__", "node_modules"})
+
+
+def iter_directories(root):
+    """Yield the directory and all its subdirectories except hidden ones (like .git) and caches."""
+    for directory, dirnames, _ in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not name.startswith(".") and name not in SKIPPED_DIRS]
+        yield directory
+
+
+class InotifyWatcher:
+    def __init__(self, roots):
+        libc_name = ctypes.util.find_library("c")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not supported")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "Failed to initialize inotify")
+        self.roots = roots
+        self.watches = {}
+        try:
+            for root in roots:
+                self.add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def add_tree(self, root):
+        for directory in iter_directories(root):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Failed to watch '{directory}'")
+            self.watches[wd] = directory
+
+    def wait(self, timeout=None):
+        """Wait for changes and return set of changed paths (empty if there was no change before the timeout)."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        for wd, mask, name in self.read_events():
+            if mask & IN_Q_OVERFLOW:  # events were lost, report all watched directories as changed
+                changed.update(self.watches.values())
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self.add_tree(path)
+                except OSError:  # directory was already removed
+                    pass
+            changed.add(path)
+        return changed
+
+    def read_events(self):
+        data = b""
+        while True:
+            try:
+                chunk = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            data += chunk
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            yield wd, mask, name
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    def __init__(self, roots, interval=1.0):
+        self.roots = roots
+        self.interval = interval
+        self.state = self.scan()
+
+    def scan(self):
+        state = {}
+        for root in self.roots:
+            for directory in iter_directories(root):
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:  # directory was removed during the scan
+                    continue
+                for entry in entries:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def wait(self, timeout=None):
+        """Wait for changes and return set of changed paths (empty if there was no change before the timeout)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self.scan()
+            changed = {path for path in state.keys() | self.state.keys() if state.get(path) != self.state.get(path)}
+            self.state = state
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            delay = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+def create_watcher(roots, polling_interval=1.0):
+    """Return inotify watcher if it is supported and polling watcher otherwise."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, polling_interval)
+
+
+def get_watched_roots(config):
+    """Return directories with the source, resources and output files, without directories nested in other ones."""
+    directories = [config.path, *config.resource, *(output.parent for output in config.output)]
+    directories = sorted({os.path.realpath(directory) for directory in directories if os.path.isdir(directory)})
+    roots = []
+    for directory in directories:
+        if not any(directory == root or directory.startswith(root + os.sep) for root in roots):
+            roots.append(directory)
+    return roots
+
+
+def filter_relevant(changed_paths, config):
+    """Return changed paths that can affect the analysis - Robot Framework files, libraries, outputs and .gitignore."""
+    outputs = {os.path.realpath(output) for output in config.output}
+    relevant = set()
+    for path in changed_paths:
+        path = os.path.realpath(path)
+        name = os.path.basename(path)
+        extension = os.path.splitext(name)[1]
+        # path without extension can be a directory that was created, removed or renamed
+        if extension in INCLUDE_EXT or not extension or name == ".gitignore" or path in outputs:
+            relevant.add(path)
+        if name == "__init__.py":  # package library is mapped by its directory
+            relevant.add(os.path.dirname(path))
+    return relevant
+
+
+def watch(sherlock, debounce=0.3):
+    """Analyse the source and analyse it again on every change until interrupted."""
+    sherlock.run()
+    watcher = create_watcher(get_watched_roots(sherlock.config))
+    sherlock.log(f"Watching for changes (using {type(watcher).__name__}). Press Ctrl+C to stop")
+    try:
+        while True:
+            changed = watcher.wait()
+            while True:  # editors often write the file in several steps, wait until the changes settle
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            changed = filter_relevant(changed, sherlock.config)
+            if not changed:
+                continue
+            sherlock.log(f"\nDetected changes in {len(changed)} file(s), analysing again")
+            sherlock.refresh(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
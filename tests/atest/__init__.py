@@ -6,9 +6,12 @@ from sherlock.config import Config, _process_pythonpath
 from sherlock.core import Sherlock
 
 
-def run_sherlock(robot_output, source, report=None, resource=None, pythonpath=None):
+def run_sherlock(robot_output, source, report=None, resource=None, pythonpath=None, stream_output=False, jobs=None):
     config = Config(from_cli=False)
-    config.output = robot_output
+    if robot_output is not None:
+        config.output = robot_output if isinstance(robot_output, list) else [robot_output]
+    config.stream_output = stream_output
+    config.jobs = jobs
     config.path = source
     if report is not None:
         config.report = report
@@ -49,12 +52,8 @@ def match_tree(expected, actual):
         expected["keywords"] = sort_by_name(expected["keywords"])
         actual["keywords"] = sort_by_name(actual["keywords"])
         for exp_keyword, act_keyword in zip(expected["keywords"], actual["keywords"]):
-            if "used" not in exp_keyword:
-                act_keyword.pop("used", None)
-            if "complexity" not in exp_keyword:
-                act_keyword.pop("complexity", None)
-            if "status" not in exp_keyword:
-                act_keyword.pop("status", None)
+            for key in set(act_keyword) - set(exp_keyword):  # compare only expected statistics
+                act_keyword.pop(key)
             if exp_keyword != act_keyword:
                 return False
 
@@ -127,7 +126,9 @@ class AcceptanceTest:
         cmd += f" {source}"
         subprocess.run(cmd.split(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-    def run_sherlock(self, source=None, resource=None, report=None, pythonpath=None, run_robot=True):
+    def run_sherlock(
+        self, source=None, resource=None, report=None, pythonpath=None, run_robot=True, stream_output=False, jobs=None
+    ):
         if report is None:
             report = ["json"]
         if run_robot:
@@ -139,7 +140,15 @@ class AcceptanceTest:
             source = source if source.is_dir() else source.parent
         else:
             source = self.ROOT
-        run_sherlock(robot_output=robot_output, source=source, report=report, resource=resource, pythonpath=pythonpath)
+        run_sherlock(
+            robot_output=robot_output,
+            source=source,
+            report=report,
+            resource=resource,
+            pythonpath=pythonpath,
+            stream_output=stream_output,
+            jobs=jobs,
+        )
         data = get_output(f"sherlock_{source.name}.json")
         return data
 
@@ -1,13 +1,16 @@
 from pathlib import Path
 
+import pytest
+
 from tests.atest import AcceptanceTest, Keyword, Tree
 
 
 class TestDictVariables(AcceptanceTest):
     ROOT = Path(__file__).parent / "test_data"
 
-    def test(self):
-        data = self.run_sherlock(source=self.ROOT / "test.robot")
+    @pytest.mark.parametrize("jobs", [None, 2])
+    def test(self, jobs):
+        data = self.run_sherlock(source=self.ROOT / "test.robot", jobs=jobs)
         expected = Tree(
             name="test_data",
             res_type="Directory",
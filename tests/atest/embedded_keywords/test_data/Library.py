@@ -0,0 +1,11 @@
+from robot.api.deco import keyword
+
+
+class Library:
+    @keyword("Open ${page} Page")
+    def open_page(self, page):
+        pass
+
+    @keyword("Close ${page} Page")
+    def close_page(self, page):
+        pass
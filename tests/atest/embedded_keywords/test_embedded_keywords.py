@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from tests.atest import AcceptanceTest, Keyword, Tree
+
+
+class TestEmbeddedKeywords(AcceptanceTest):
+    ROOT = Path(__file__).parent / "test_data"
+
+    def test(self):
+        data = self.run_sherlock()
+        expected = Tree(
+            name="test_data",
+            children=[
+                Tree(
+                    name="Library",
+                    keywords=[Keyword(name="Close ${page} Page", used=0), Keyword(name="Open ${page} Page", used=1)],
+                ),
+                Tree(
+                    name="embedded.resource",
+                    keywords=[
+                        Keyword(name="Click ${button}", used=1),
+                        # ambiguous - matches both 'Click ${button}' and 'Click ${button} Twice'
+                        Keyword(name="Click ${button} Twice", used=0),
+                        Keyword(name="Select ${index:\\d+}", used=1),
+                        Keyword(name="Select Item", used=1),
+                    ],
+                ),
+                Tree(name="test.robot", keywords=[]),
+            ],
+        )
+        self.should_match_tree(expected, data)
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from tests.atest import AcceptanceTest, Keyword, Tree
 
 
@@ -7,8 +9,9 @@ class TestImportWithVariable(AcceptanceTest):
     ROOT = Path(__file__).parent / "test_data"
     TEST_PATH = "tests"
 
-    def test(self):
-        data = self.run_sherlock()
+    @pytest.mark.parametrize("jobs", [None, 2])
+    def test(self, jobs):
+        data = self.run_sherlock(jobs=jobs)
         expected = Tree(
             name="test_data",
             children=[
@@ -1,13 +1,16 @@
 from pathlib import Path
 
+import pytest
+
 from tests.atest import AcceptanceTest, Keyword, Tree
 
 
 class TestRunKeywords(AcceptanceTest):
     ROOT = Path(__file__).parent / "test_data"
 
-    def test(self):
-        data = self.run_sherlock()
+    @pytest.mark.parametrize("stream_output", [False, True])
+    def test(self, stream_output):
+        data = self.run_sherlock(stream_output=stream_output)
         expected = Tree(
             name="test_data",
             children=[
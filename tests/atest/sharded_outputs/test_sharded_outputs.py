@@ -0,0 +1,37 @@
+import subprocess
+from pathlib import Path
+
+from tests.atest import AcceptanceTest, Keyword, Tree, get_output, run_sherlock
+
+
+class TestShardedOutputs(AcceptanceTest):
+    ROOT = Path(__file__).parent / "test_data"
+
+    def run_shards(self):
+        outputs = []
+        for suite in ("suite_a", "suite_b"):
+            output = self.ROOT / f"output_{suite}.xml"
+            cmd = f"robot --output {output} --log NONE --report NONE {self.ROOT / suite}.robot"
+            subprocess.run(cmd.split(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            outputs.append(output)
+        return outputs
+
+    def test(self):
+        run_sherlock(robot_output=self.run_shards(), source=self.ROOT, report=["json"])
+        data = get_output(f"sherlock_{self.ROOT.name}.json")
+        expected = Tree(
+            name="test_data",
+            children=[
+                Tree(
+                    name="common.resource",
+                    keywords=[
+                        Keyword(name="Shared Keyword", used=3),
+                        Keyword(name="Nested Keyword", used=8),
+                        Keyword(name="Not Used", used=0),
+                    ],
+                ),
+                Tree(name="suite_a.robot", keywords=[Keyword(name="Local Keyword", used=1)]),
+                Tree(name="suite_b.robot", keywords=[]),
+            ],
+        )
+        self.should_match_tree(expected, data)
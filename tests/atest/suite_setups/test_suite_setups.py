@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from tests.atest import AcceptanceTest, Keyword, Tree
 
 
@@ -7,8 +9,9 @@ class TestSuiteSetups(AcceptanceTest):
     ROOT = Path(__file__).parent / "test_data"
     TEST_PATH = "tests"
 
-    def test(self):
-        data = self.run_sherlock()
+    @pytest.mark.parametrize("stream_output", [False, True])
+    def test(self, stream_output):
+        data = self.run_sherlock(stream_output=stream_output)
         expected = Tree(
             name="test_data",
             children=[
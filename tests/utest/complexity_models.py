@@ -46,3 +46,37 @@ Keyword
     ...  ${args}
 
 """
+
+model_while_complexity = """
+*** Keywords ***
+Keyword
+    Keyword Call
+    WHILE  condition
+        Keyword Call
+    END
+
+"""
+
+model_try_complexity = """
+*** Keywords ***
+Keyword
+    TRY
+        Keyword Call
+    EXCEPT  First error
+        Keyword Call
+    EXCEPT  Second error
+        Keyword Call
+    FINALLY
+        Keyword Call
+    END
+
+"""
+
+model_inline_if_complexity = """
+*** Keywords ***
+Keyword
+    Keyword Call
+    IF  condition    Keyword Call
+    ${value}    IF  condition    Keyword Call    ELSE    Another Keyword Call
+
+"""
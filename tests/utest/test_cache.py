@@ -0,0 +1,135 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+import sherlock.model
+from sherlock.cache import Cache, library_fingerprint
+from sherlock.model import Library, Resource, Tree
+
+RESOURCE = """
+*** Settings ***
+Library    Collections    WITH NAME    Coll
+Resource    other.resource
+
+*** Variables ***
+${SCALAR}    value
+@{LIST}    a    b
+&{DICT}    key=value
+
+*** Keywords ***
+Keyword
+    IF    $cond
+        Log    1
+    END
+
+Keyword With ${embedded}
+    No Operation
+"""
+
+LIBRARY = """
+from robot.api.deco import keyword
+
+
+class Library:
+    def normal_keyword(self):
+        pass
+
+    @keyword("Embedded ${arg}")
+    def embedded(self, arg):
+        pass
+"""
+
+
+@pytest.fixture
+def library_path(tmp_path):
+    path = tmp_path / "Library.py"
+    path.write_text(LIBRARY)
+    return path
+
+
+@pytest.fixture
+def resource_path(tmp_path):
+    path = tmp_path / "source" / "file.resource"
+    path.parent.mkdir()
+    path.write_text(RESOURCE)
+    return path
+
+
+class TestCache:
+    def test_resource_data_round_trip(self, tmp_path, resource_path):
+        cache = Cache(tmp_path / "cache")
+        cache.set_resource(resource_path, Resource(resource_path).to_data())
+        resource = Resource(resource_path, data=cache.get_resource(resource_path))
+        assert [(kw.name, kw.complexity, kw.length, kw.nesting_depth) for kw in resource.keywords] == [
+            ("Keyword", 2, 4, 1),
+            ("Keyword With ${embedded}", 1, 2, 0),
+        ]
+        assert resource.keywords.find_kw("Keyword With argument")
+        assert resource.resources == ["other.resource"]
+        assert resource.libraries == {("Collections", "Coll"): ()}
+        assert resource.variables["@{LIST}"] == ["a", "b"]
+        assert resource.variables["&{DICT}"] == {"key": "value"}
+
+    def test_not_cached(self, tmp_path, resource_path):
+        assert Cache(tmp_path / "cache").get_resource(resource_path) is None
+
+    def test_changed_file_is_not_cached(self, tmp_path, resource_path):
+        cache = Cache(tmp_path / "cache")
+        cache.set_resource(resource_path, Resource(resource_path).to_data())
+        resource_path.write_text(RESOURCE + "\nOther Keyword\n    No Operation\n")
+        assert cache.get_resource(resource_path) is None
+
+    def test_touched_file_with_the_same_content_is_cached(self, tmp_path, resource_path):
+        cache = Cache(tmp_path / "cache")
+        cache.set_resource(resource_path, Resource(resource_path).to_data())
+        stat = os.stat(resource_path)
+        os.utime(resource_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.get_resource(resource_path) is not None
+
+    def test_other_robot_version_is_not_cached(self, tmp_path, resource_path):
+        cache = Cache(tmp_path / "cache")
+        cache.set_resource(resource_path, Resource(resource_path).to_data())
+        cache.versions["robot"] = "0.1"
+        assert cache.get_resource(resource_path) is None
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_unchanged_files_are_not_parsed(self, tmp_path, resource_path, jobs):
+        cache = Cache(tmp_path / "cache")
+        Tree.from_directory(resource_path.parent, jobs=jobs, cache=cache)
+        with patch.object(Resource, "load_model_from_resource", side_effect=AssertionError("File parsed")):
+            tree = Tree.from_directory(resource_path.parent, jobs=jobs, cache=cache)
+        assert [kw.name for kw in tree.children[0].keywords] == ["Keyword", "Keyword With ${embedded}"]
+
+
+class TestLibraryCache:
+    def load_library(self, path, cache):
+        library = Library(path)
+        library.load_library([], None, "test.robot", cache)
+        return library
+
+    def test_cached_library_is_not_imported(self, tmp_path, library_path):
+        cache = Cache(tmp_path / "cache")
+        self.load_library(library_path, cache)
+        with patch.object(sherlock.model, "introspect_library", side_effect=AssertionError("Library imported")):
+            library = self.load_library(library_path, cache)
+        assert library.name == "Library"
+        assert library.search("Normal Keyword")
+        assert library.search("Embedded value")
+
+    def test_changed_library_is_not_cached(self, tmp_path, library_path):
+        cache = Cache(tmp_path / "cache")
+        self.load_library(library_path, cache)
+        library_path.write_text(LIBRARY + "\n    def other_keyword(self):\n        pass\n")
+        assert cache.get_library(str(library_path), []) is None
+
+    def test_library_with_other_args_is_not_cached(self, tmp_path, library_path):
+        cache = Cache(tmp_path / "cache")
+        self.load_library(library_path, cache)
+        assert cache.get_library(str(library_path), ["arg"]) is None
+
+    def test_library_fingerprint(self, library_path):
+        assert library_fingerprint("Collections") == "stdlib"
+        assert library_fingerprint("idontexist") is None
+        assert "pathspec==" in library_fingerprint("pathspec")
+        assert str(library_path) in library_fingerprint(str(library_path))
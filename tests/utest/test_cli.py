@@ -37,7 +37,27 @@ class TestCli:
             f"sherlock --output {fp.name} .".split(),
         ):
             config = Config()
-            assert config.output == Path(fp.name)
+            assert config.output == [Path(fp.name)]
+
+    def test_multiple_outputs(self, tmp_path):
+        outputs = [tmp_path / "output1.xml", tmp_path / "output2.xml"]
+        for output in outputs:
+            output.touch()
+        with patch.object(
+            sys,
+            "argv",
+            f"sherlock --output {outputs[0]} --output {outputs[1]} .".split(),
+        ):
+            config = Config()
+            assert config.output == outputs
+
+    def test_output_glob(self, tmp_path):
+        outputs = [tmp_path / "output1.xml", tmp_path / "output2.xml"]
+        for output in outputs:
+            output.touch()
+        with patch.object(sys, "argv", ["sherlock", "--output", str(tmp_path / "output*.xml"), "."]):
+            config = Config()
+            assert config.output == outputs
 
     def test_default_output(self):
         with tempfile.NamedTemporaryFile() as fp, patch.object(
@@ -48,7 +68,7 @@ class TestCli:
             f"sherlock {Path(fp.name).parent}".split(),
         ):
             config = Config()
-            assert config.output == config.path / fp.name
+            assert config.output == [config.path / fp.name]
 
     def test_default_source(self):
         with patch.object(sys, "argv", ["sherlock"]):
@@ -64,15 +84,16 @@ class TestCli:
     def test_invalid_report(self):
         with patch.object(sys, "argv", "sherlock --report print,invalid".split(),), pytest.raises(
             SherlockFatalError,
-            match="Provided report 'invalid' does not exist. Use comma separated list of values from: html,json,print",
+            match="Provided report 'invalid' does not exist. "
+            "Use comma separated list of values from: hotspots,html,json,print",
         ):
             Sherlock()
 
     def test_invalid_report_similar(self):
         with patch.object(sys, "argv", "sherlock --report printt".split(),), pytest.raises(
             SherlockFatalError,
-            match="Provided report 'printt' does not exist. Use comma separated list of values from: html,json,print. "
-            "Did you mean:\n    print",
+            match="Provided report 'printt' does not exist. "
+            "Use comma separated list of values from: hotspots,html,json,print. Did you mean:\n    print",
         ):
             Sherlock()
 
@@ -1,14 +1,33 @@
 import pytest
 from robot.api import get_model
 
-from sherlock.model import KeywordStats
+from sherlock.model import KeywordStats, ResourceVisitor
 
-from .complexity_models import model_1complexity, model_3complexity, model_5complexity
+from .complexity_models import (
+    model_1complexity,
+    model_3complexity,
+    model_5complexity,
+    model_inline_if_complexity,
+    model_try_complexity,
+    model_while_complexity,
+)
+
+
+def get_keyword(string_model):
+    return get_model(string_model, data_only=True).sections[0].body[0]
 
 
 class TestComplexity:
     @pytest.mark.parametrize(
-        "string_model, complexity", [(model_1complexity, 1), (model_3complexity, 3), (model_5complexity, 5)]
+        "string_model, complexity",
+        [
+            (model_1complexity, 1),
+            (model_3complexity, 3),
+            (model_5complexity, 5),
+            (model_while_complexity, 2),
+            (model_try_complexity, 3),
+            (model_inline_if_complexity, 4),
+        ],
     )
     def test_complexity(self, string_model, complexity):
         model = get_model(string_model)
@@ -27,3 +46,31 @@ class TestComplexity:
     def test_complexity_without_model_print(self):
         kw_stat = KeywordStats(name="Dummy", parent="Dummy", node=None)
         assert "Dummy\n  Used: 0\n" == str(kw_stat)
+
+    @pytest.mark.parametrize(
+        "string_model, length, nesting_depth",
+        [
+            (model_1complexity, 7, 0),
+            (model_5complexity, 15, 2),
+            (model_try_complexity, 10, 1),
+            (model_inline_if_complexity, 4, 1),
+        ],
+    )
+    def test_length_and_nesting_depth(self, string_model, length, nesting_depth):
+        kw_stat = KeywordStats(name="Dummy", parent="Dummy", node=get_keyword(string_model))
+        assert (kw_stat.length, kw_stat.nesting_depth) == (length, nesting_depth)
+
+    def test_resource_visitor_computes_metrics_of_each_keyword(self):
+        models = [model_1complexity, model_3complexity, model_5complexity, model_while_complexity]
+        source = "*** Keywords ***\n" + "".join(
+            model.split("*** Keywords ***\n")[1].replace("Keyword\n", f"Keyword {index}\n", 1)
+            for index, model in enumerate(models)
+        )
+        visitor = ResourceVisitor("Dummy")
+        visitor.visit(get_model(source, data_only=True))
+        metrics = [(kw.complexity, kw.length, kw.nesting_depth) for kw in visitor.normal_keywords.values()]
+        expected = [
+            (kw.complexity, kw.length, kw.nesting_depth)
+            for kw in (KeywordStats("Dummy", "Dummy", node=get_keyword(model)) for model in models)
+        ]
+        assert metrics == expected == [(1, 7, 0), (3, 12, 1), (5, 15, 2), (2, 5, 1)]
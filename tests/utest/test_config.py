@@ -34,7 +34,7 @@ class TestConfig:
         ):
             config = Config()
             assert config.path == Path(tmp_path)
-            assert config.output == Path(fp.name)
+            assert config.output == [Path(fp.name)]
             assert isinstance(config.log_output, io.TextIOWrapper)
             assert config.report == ["html"]
 
@@ -46,7 +46,7 @@ class TestConfig:
         ):
             config = Config()
             assert config.path == Path(tmp_path)
-            assert config.output == Path(fp.name)
+            assert config.output == [Path(fp.name)]
             assert isinstance(config.log_output, io.TextIOWrapper)
             assert config.report == ["html"]
 
@@ -57,7 +57,7 @@ class TestConfig:
         ):
             config = Config()
             assert config.path == Path(config_dir)
-            assert config.output == Path(fp.name)
+            assert config.output == [Path(fp.name)]
             assert isinstance(config.log_output, io.TextIOWrapper)
             assert config.report == ["print", "html"]
 
@@ -113,7 +113,7 @@ class TestTomlParser:
         assert isinstance(config["log_output"], io.TextIOWrapper)
         config["log_output"] = None
         assert config == {
-            "output": Path("output.xml"),
+            "output": [Path("output.xml")],
             "log_output": None,
             "report": ["print", "html"],
             "path": ["file1.robot", "dir/"],
@@ -155,3 +155,16 @@ class TestTomlParser:
         look_up = Config(from_cli=False).__dict__
         config = TomlConfigParser(config_path=config_path, look_up=look_up).get_config()
         assert config == {"pythonpath": [str(Path.cwd() / "test_libs")], "report": ["html"]}
+
+    def test_get_config_path_filters(self):
+        config_path = TEST_DATA_DIR / "configs" / "pyproject_path_filters" / "pyproject.toml"
+        look_up = Config(from_cli=False).__dict__
+        config = TomlConfigParser(config_path=config_path, look_up=look_up).get_config()
+        assert config == {"exclude": ["venv/", "**/generated"], "include": ["*.robot", "*.resource"]}
+
+    def test_path_filters_from_cli(self, tmp_path):
+        cmd = f"sherlock --exclude venv/,node_modules/ --exclude **/generated --include *.robot {tmp_path}".split()
+        with working_directory(tmp_path), patch.object(sys, "argv", cmd):
+            config = Config()
+            assert config.exclude == ["venv/", "node_modules/", "**/generated"]
+            assert config.include == ["*.robot"]
@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from sherlock.file_utils import find_file_in_project_root, find_project_root, get_gitignore
+from sherlock.file_utils import GitIgnore, find_file_in_project_root, find_project_root, get_gitignore
 
 TEST_DATA_DIR = Path(__file__).parent.parent / "test_data"
 
@@ -65,3 +65,22 @@ class TestFileUtils:
         spec = get_gitignore(gitignore)
         assert spec.match_file("file.resource")
         assert not spec.match_file("file.robot")
+
+    def test_nested_gitignore_rules(self, tmp_path):
+        (tmp_path / "nested").mkdir()
+        (tmp_path / ".gitignore").write_text("*.resource\n/anchored/\n")
+        (tmp_path / "nested" / ".gitignore").write_text("!keep.resource\n")
+        gitignore = GitIgnore().with_file(tmp_path)
+        assert gitignore.is_ignored("file.resource", is_dir=False)
+        assert gitignore.is_ignored("anchored", is_dir=True)
+        assert not gitignore.is_ignored("anchored", is_dir=False)
+        nested = gitignore.descend("nested").with_file(tmp_path / "nested")
+        assert nested.is_ignored("file.resource", is_dir=False)
+        assert not nested.is_ignored("keep.resource", is_dir=False)
+        assert not nested.is_ignored("anchored", is_dir=True)
+
+    def test_gitignore_for_directory_outside_root(self, tmp_path):
+        (tmp_path / "root").mkdir()
+        (tmp_path / "root" / ".gitignore").write_text("*.resource\n")
+        (tmp_path / "other").mkdir()
+        assert not GitIgnore.for_directory(tmp_path / "other", tmp_path / "root").rules
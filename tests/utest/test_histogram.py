@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from sherlock.histogram import Histogram, bucket_index, bucket_upper_bound
+from sherlock.model import KeywordTimings
+
+
+def timings_from(values):
+    timings = KeywordTimings()
+    for value in values:
+        timings.add_timing(value)
+    return timings
+
+
+class TestHistogram:
+    def test_short_times_are_exact(self):
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.add(value)
+        assert [histogram.percentile(percent) for percent in (50, 90, 99, 100)] == [50, 90, 99, 100]
+
+    @pytest.mark.parametrize("value", [127, 128, 1000, 59_999, 3_600_000])
+    def test_relative_error(self, value):
+        upper_bound = bucket_upper_bound(bucket_index(value))
+        assert value <= upper_bound <= value * (1 + 1 / 64)
+
+    def test_empty(self):
+        assert Histogram().percentile(50) is None
+
+    def test_memory_is_bounded(self):
+        histogram = Histogram()
+        for value in range(100_000):
+            histogram.add(value)
+        assert len(histogram.counts) < 800
+
+    def test_merge_equals_adding_all_values(self):
+        rng = random.Random(0)
+        values = [rng.randint(0, 10_000) for _ in range(1000)]
+        first, second = Histogram(), Histogram()
+        for value in values[:300]:
+            first.add(value)
+        for value in values[300:]:
+            second.add(value)
+        first.merge(second)
+        whole = Histogram()
+        for value in values:
+            whole.add(value)
+        assert first.counts == whole.counts
+        assert first.count == whole.count == 1000
+
+    def test_round_trip(self):
+        histogram = Histogram()
+        for value in (1, 5, 5, 1000):
+            histogram.add(value)
+        assert Histogram.from_list(histogram.to_list()).counts == histogram.counts
+
+
+class TestKeywordTimingsPercentiles:
+    def test_percentiles(self):
+        timings = timings_from([10] * 90 + [2000] * 9 + [5000])
+        assert timings.percentiles() == {"p50": 10, "p90": 10, "p99": 2015}
+        assert (timings.p50, timings.p99) == ("0.01", "2.015")
+
+    def test_percentile_does_not_exceed_longest_execution(self):
+        timings = timings_from([1000, 1001])
+        assert timings.percentile(99) == 1001
+
+    def test_without_executions(self):
+        timings = KeywordTimings()
+        assert timings.percentiles() == {"p50": None, "p90": None, "p99": None}
+        assert timings.p90 == "0"
+
+    def test_histogram_is_created_with_first_execution(self):
+        timings = KeywordTimings()
+        assert timings._histogram is None
+        assert timings.to_dict()["histogram"] == []
+        assert KeywordTimings.from_dict(timings.to_dict())._histogram is None
+        executed = timings_from([10, 20])
+        timings.merge(executed)
+        executed.add_timing(30)  # merged histogram is not shared
+        assert timings.percentiles() == {"p50": 10, "p90": 20, "p99": 20}
+
+    def test_add_merges_executions(self):
+        total = timings_from([10, 20]) + timings_from([30, 4000])
+        assert total.to_dict() == timings_from([10, 20, 30, 4000]).to_dict()
+        assert total.percentile(50) == 20
+
+    def test_add_merges_histograms(self):
+        total = timings_from([10, 20]) + timings_from([30, 4000])
+        assert total.to_dict()["histogram"] == timings_from([10, 20, 30, 4000]).to_dict()["histogram"]
+        assert total.percentile(50) == 20
+
+    def test_round_trip(self):
+        timings = timings_from([10, 20, 4000])
+        assert KeywordTimings.from_dict(timings.to_dict()).percentiles() == timings.percentiles()
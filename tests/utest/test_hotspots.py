@@ -0,0 +1,83 @@
+import pytest
+
+from sherlock.exceptions import ConfigGeneralError
+from sherlock.model import KeywordStats, Tree
+from sherlock.report import get_reports
+from sherlock.report.hotspots import get_hotspots
+
+
+class File:
+    type = "Resource"
+
+    def __init__(self, path, keywords):
+        self.path = path
+        self.keywords = keywords
+
+    def get_resources(self):
+        return self.path, self
+
+
+def keyword(name, times, complexity=1, self_times=None):
+    kw_stat = KeywordStats(name, parent="file", complexity=complexity)
+    for index, elapsed in enumerate(times):
+        kw_stat.used += 1
+        kw_stat.timings.add_timing(elapsed, None if self_times is None else self_times[index])
+    return kw_stat
+
+
+@pytest.fixture
+def tree():
+    tree = Tree("root")
+    nested = Tree("nested")
+    tree.children = [
+        File("a.resource", [keyword("Wrapper", [1000, 1000], self_times=[1, 1]), keyword("Unused", [])]),
+        nested,
+    ]
+    nested.children = [
+        File("b.resource", [keyword("Slow", [900, 950]), keyword("Spiky", [10, 10, 5000], complexity=4)]),
+        File("Library.py", None),
+    ]
+    return tree
+
+
+def names(hotspots):
+    return [kw.name for _, _, kw in hotspots]
+
+
+class TestHotspots:
+    @pytest.mark.parametrize(
+        "metric, expected",
+        [
+            ("total_time", ["Spiky", "Wrapper", "Slow"]),
+            ("self_time", ["Spiky", "Slow", "Wrapper"]),
+            ("p99", ["Spiky", "Wrapper", "Slow"]),
+            ("executions", ["Spiky", "Wrapper", "Slow"]),
+            ("complexity_executions", ["Spiky", "Wrapper", "Slow"]),
+        ],
+    )
+    def test_rank_by_metric(self, tree, metric, expected):
+        assert names(get_hotspots(tree, metric, top=10)) == expected
+
+    def test_top_n(self, tree):
+        hotspots = get_hotspots(tree, "self_time", top=2)
+        assert names(hotspots) == ["Spiky", "Slow"]
+        assert [(value, path) for value, path, _ in hotspots] == [(5020, "b.resource"), (1850, "b.resource")]
+
+    def test_report(self, tree, capsys):
+        report = get_reports(["hotspots"], ["hotspots:top:1", "hotspots:rank_by:executions"])["hotspots"]
+        report.get_report(tree, "root", None)
+        output = capsys.readouterr().out
+        assert "Top 1 keywords in root by executions" in output
+        assert "Spiky" in output and "Wrapper" not in output
+
+    @pytest.mark.parametrize(
+        "config, error",
+        [
+            ("hotspots:top:0", "Invalid value '0' of hotspots report 'top' parameter"),
+            ("hotspots:rank_by:unknown", "Invalid value 'unknown' of hotspots report 'rank_by' parameter"),
+            ("hotspots:unknown:1", "Report 'hotspots' does not have 'unknown' parameter"),
+        ],
+    )
+    def test_invalid_configuration(self, config, error):
+        with pytest.raises(ConfigGeneralError, match=error):
+            get_reports(["hotspots"], [config])
@@ -0,0 +1,187 @@
+import io
+import shutil
+import subprocess
+
+import pytest
+import robot
+
+from sherlock.config import Config
+from sherlock.core import Sherlock
+from sherlock.exceptions import SherlockFatalError
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+FIRST_SUITE = """
+*** Settings ***
+Resource    first.resource
+
+*** Test Cases ***
+Test
+    First Keyword
+    First Keyword
+    Shared Keyword
+"""
+
+SECOND_SUITE = """
+*** Settings ***
+Resource    second.resource
+
+*** Test Cases ***
+Test
+    Second Keyword
+    Shared Keyword
+"""
+
+FIRST_RESOURCE = """
+*** Settings ***
+Resource    second.resource
+
+*** Keywords ***
+First Keyword
+    No Operation
+"""
+
+SECOND_RESOURCE = """
+*** Variables ***
+${DELAY}    0
+
+*** Keywords ***
+Second Keyword
+    No Operation
+
+Shared Keyword
+    Sleep    ${DELAY}
+
+Not Used
+    No Operation
+"""
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    for name, content in (
+        ("first.robot", FIRST_SUITE),
+        ("second.robot", SECOND_SUITE),
+        ("first.resource", FIRST_RESOURCE),
+        ("second.resource", SECOND_RESOURCE),
+    ):
+        (repo / name).write_text(content)
+    git(repo, "init", "-q")
+    git(repo, "add", ".")
+    git(repo, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init")
+    return repo
+
+
+def run_sherlock(repo, changed_since=None, cache_dir=None, output=None):
+    config = Config(from_cli=False)
+    config.path = repo
+    config.output = [] if output is None else [output]
+    config.root = repo
+    config.cache_dir = repo.parent / "cache" if cache_dir is None else cache_dir
+    config.changed_since = changed_since
+    config.report = []
+    sherlock = Sherlock(config=config)
+    sherlock.run()
+    return sherlock
+
+
+def run_robot(repo, output, delay="0"):
+    robot.run(str(repo), output=str(output), variable=[f"DELAY:{delay}"], log=None, report=None, stdout=io.StringIO())
+    return output
+
+
+def get_usage(sherlock, repo):
+    return {
+        (path.name, kw_stat.name): kw_stat.used
+        for path in (repo / "first.resource", repo / "second.resource")
+        for kw_stat in sherlock.resources[str(path.resolve())].keywords
+    }
+
+
+class TestIncrementalAnalysis:
+    def test_unchanged_suites_are_reused(self, repo):
+        full = get_usage(run_sherlock(repo), repo)
+        assert full == {
+            ("first.resource", "First Keyword"): 2,
+            ("second.resource", "Second Keyword"): 1,
+            ("second.resource", "Shared Keyword"): 2,
+            ("second.resource", "Not Used"): 0,
+        }
+        sherlock = run_sherlock(repo, changed_since="HEAD")
+        assert get_usage(sherlock, repo) == full
+        # directory suite and two file suites
+        assert (sherlock.incremental.reused, sherlock.incremental.analysed) == (3, 0)
+
+    def test_new_output_of_unchanged_suites_is_reused(self, repo):
+        run_sherlock(repo, output=run_robot(repo, repo.parent / "first.xml", delay="0.01"))
+        output = run_robot(repo, repo.parent / "second.xml", delay="0.05")
+        sherlock = run_sherlock(repo, changed_since="HEAD", output=output)
+        assert (sherlock.incremental.reused, sherlock.incremental.analysed) == (4, 0)
+        full = run_sherlock(repo, output=output)
+        for path in ("first.resource", "second.resource"):
+            keywords = sherlock.resources[str((repo / path).resolve())].keywords
+            expected = full.resources[str((repo / path).resolve())].keywords
+            # execution times are taken from the new output, not from the snapshot
+            assert [(kw.used, kw.timings.to_dict()) for kw in keywords] == [
+                (kw.used, kw.timings.to_dict()) for kw in expected
+            ]
+
+    def test_changed_suite_is_analysed_again(self, repo):
+        run_sherlock(repo)
+        (repo / "second.robot").write_text(SECOND_SUITE + "    Not Used\n")
+        sherlock = run_sherlock(repo, changed_since="HEAD")
+        assert (sherlock.incremental.reused, sherlock.incremental.analysed) == (2, 1)
+        usage = get_usage(sherlock, repo)
+        assert usage[("second.resource", "Not Used")] == 1
+        assert usage[("second.resource", "Shared Keyword")] == 2
+
+    def test_suites_importing_changed_file_transitively_are_analysed_again(self, repo):
+        run_sherlock(repo)
+        (repo / "second.resource").write_text(SECOND_RESOURCE.replace("Shared Keyword", "Renamed Keyword"))
+        sherlock = run_sherlock(repo, changed_since="HEAD")
+        assert (sherlock.incremental.reused, sherlock.incremental.analysed) == (1, 2)
+        usage = get_usage(sherlock, repo)
+        assert usage[("first.resource", "First Keyword")] == 2
+        assert usage[("second.resource", "Renamed Keyword")] == 0
+
+    def test_snapshot_of_other_revision_is_not_used(self, repo):
+        run_sherlock(repo)
+        (repo / "new.txt").write_text("")
+        git(repo, "add", ".")
+        git(repo, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "second")
+        sherlock = run_sherlock(repo, changed_since="HEAD")
+        assert sherlock.incremental.previous is None
+        assert (sherlock.incremental.reused, sherlock.incremental.analysed) == (0, 3)
+        assert get_usage(sherlock, repo)[("second.resource", "Shared Keyword")] == 2
+
+    def test_untracked_files_do_not_prevent_snapshot(self, repo):
+        (repo / "output.xml").write_text("")
+        (repo / "sherlock_repo.json").write_text("")
+        run_sherlock(repo, cache_dir=repo / ".sherlock_cache")
+        sherlock = run_sherlock(repo, changed_since="HEAD", cache_dir=repo / ".sherlock_cache")
+        assert sherlock.incremental.previous is not None
+        assert (sherlock.incremental.reused, sherlock.incremental.analysed) == (3, 0)
+
+    def test_snapshot_is_not_stored_with_uncommitted_changes(self, repo, capsys):
+        (repo / "second.robot").write_text(SECOND_SUITE + "    Not Used\n")
+        sherlock = run_sherlock(repo)
+        assert sherlock.incremental is None
+        assert "Analysis snapshot will not be stored" in capsys.readouterr().out
+        assert not (repo.parent / "cache" / "snapshots").exists()
+
+    def test_changed_since_requires_cache_dir(self, repo):
+        config = Config(from_cli=False)
+        config.path = repo
+        config.changed_since = "HEAD"
+        with pytest.raises(SherlockFatalError, match="requires --cache-dir"):
+            Sherlock(config=config).run()
+
+    def test_invalid_revision(self, repo):
+        with pytest.raises(SherlockFatalError, match="Failed to resolve git revision 'not-existing'"):
+            run_sherlock(repo, changed_since="not-existing")
@@ -0,0 +1,52 @@
+from sherlock.model import EmbeddedKeywordsIndex, KeywordIndex, KeywordStats, Library, Resource, get_embedded_pattern
+
+
+def create_index(*names):
+    index = EmbeddedKeywordsIndex()
+    for name in names:
+        index.add(name, get_embedded_pattern(name), KeywordStats(name, parent="Dummy"))
+    return index
+
+
+class TestEmbeddedKeywordsIndex:
+    def test_not_embedded_name(self):
+        assert get_embedded_pattern("Keyword") is None
+
+    def test_find_by_prefix(self):
+        index = create_index("Click ${button}", "Open ${page} Page", "Close ${page} Page")
+        assert [kw.name for kw in index.find("open main page")] == ["Open ${page} Page"]
+        assert index.find("Open Main") == []
+        assert index.find("Unknown") == []
+
+    def test_find_without_literal_prefix(self):
+        index = create_index("${count} Items Selected", "Select ${count} Items")
+        assert [kw.name for kw in index.find("10 Items Selected")] == ["${count} Items Selected"]
+
+    def test_all_matches_in_definition_order(self):
+        index = create_index("Click ${button} Twice", "${action} Save Twice", "Click ${button}")
+        assert [kw.name for kw in index.find("Click Save Twice")] == [
+            "Click ${button} Twice",
+            "${action} Save Twice",
+            "Click ${button}",
+        ]
+
+
+class TestKeywordIndex:
+    def test_find_definitions(self, tmp_path):
+        (tmp_path / "a.resource").write_text("*** Keywords ***\nMy Keyword\n    No Operation\n")
+        (tmp_path / "b.resource").write_text("*** Keywords ***\nmy_keyword\n    No Operation\nMy ${arg}\n    Log  1\n")
+        (tmp_path / "c.resource").write_text("*** Keywords ***\nMy ${arg}\n    No Operation\n")
+        files = [Resource(tmp_path / name) for name in ("a.resource", "b.resource", "c.resource")]
+        index = KeywordIndex.from_files(files)
+        found = [(file.name, kw_stat.name) for file, kw_stat in index.find_definitions("my keyword")]
+        assert found == [("a.resource", "My Keyword"), ("b.resource", "my_keyword"), ("c.resource", "My ${arg}")]
+        assert index.find_definitions("Other") == []
+
+    def test_not_loaded_library_is_not_indexed(self):
+        library = Library("BuiltIn")
+        index = KeywordIndex.from_files([library])
+        assert not index.indexed
+        library.load_library([], [], "builtin")
+        index.add_file(library)
+        index.add_file(library)
+        assert len(index.indexed) == 1
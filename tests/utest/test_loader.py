@@ -0,0 +1,105 @@
+import sys
+
+import pytest
+from robot.errors import DataError
+
+from sherlock.loader import LibraryLoader
+from sherlock.model import Library
+
+WORKING_LIBRARY = """
+def working_keyword():
+    pass
+"""
+
+HANGING_LIBRARY = """
+import time
+
+time.sleep(60)
+
+
+def hanging_keyword():
+    pass
+"""
+
+EXITING_LIBRARY = """
+import os
+
+os._exit(1)
+"""
+
+
+@pytest.fixture
+def libraries(tmp_path, monkeypatch):
+    for name, source in (
+        ("WorkingLib", WORKING_LIBRARY),
+        ("HangingLib", HANGING_LIBRARY),
+        ("ExitingLib", EXITING_LIBRARY),
+    ):
+        (tmp_path / f"{name}.py").write_text(source)
+    monkeypatch.setattr(sys, "path", [str(tmp_path)] + sys.path)
+    return tmp_path
+
+
+@pytest.fixture
+def loader():
+    library_loader = LibraryLoader(timeout=2)
+    yield library_loader
+    library_loader.close()
+
+
+class TestLibraryLoader:
+    def test_import_library(self, libraries, loader):
+        data = loader.submit("WorkingLib", []).result()
+        assert data.name == "WorkingLib"
+        assert data.keywords == ["Working Keyword"]
+
+    def test_import_error(self, libraries, loader):
+        handle = loader.submit("NotExistingLib", [])
+        with pytest.raises(DataError, match="NotExistingLib"):
+            handle.result()
+
+    def test_hanging_import_is_killed(self, libraries, loader):
+        hanging = loader.submit("HangingLib", [])
+        working = loader.submit("WorkingLib", [])
+        with pytest.raises(DataError, match="Importing library 'HangingLib' timed out after 2 seconds"):
+            hanging.result()
+        assert working.result().keywords == ["Working Keyword"]
+        assert not hanging.process.is_alive()
+
+    def test_timed_out_library_is_not_imported_again(self, libraries, loader):
+        with pytest.raises(DataError):
+            loader.submit("HangingLib", []).result()
+        handle = loader.submit("HangingLib", [])
+        assert handle.done and handle.process is None
+        with pytest.raises(DataError, match="timed out"):
+            handle.result()
+
+    def test_crashing_import(self, libraries, loader):
+        with pytest.raises(DataError, match="process exited unexpectedly"):
+            loader.submit("ExitingLib", []).result()
+
+    def test_imports_limited_by_processes(self, libraries):
+        loader = LibraryLoader(timeout=2, processes=1)
+        try:
+            first = loader.submit("WorkingLib", [])
+            second = loader.submit("ExitingLib", [])
+            assert first.process is not None and second.process is None
+            assert first.result().name == "WorkingLib"
+            assert second.process is not None
+        finally:
+            loader.close()
+
+
+class TestIsolatedLibrary:
+    def test_errors_are_reported_in_library(self, libraries, loader):
+        working, hanging, exiting = Library("WorkingLib"), Library("HangingLib"), Library("ExitingLib")
+        for library in (working, hanging, exiting):
+            library.load_library([], None, "suite.robot", loader=loader)
+        for library in (working, hanging, exiting):
+            library.wait_for_import()
+        assert working.keywords.find_kw("Working Keyword")
+        assert not working.errors
+        assert not hanging.keywords
+        assert hanging.errors == {"suite.robot: Importing library 'HangingLib' timed out after 2 seconds"}
+        assert not exiting.keywords
+        assert exiting.errors == {"suite.robot: Importing library 'ExitingLib' failed: process exited unexpectedly"}
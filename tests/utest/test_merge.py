@@ -0,0 +1,140 @@
+import random
+
+import pytest
+
+from sherlock.model import KeywordTimings
+from sherlock.streaming import KeywordCalls
+
+SEEDS = range(20)
+KEYWORDS = [("Keyword 1", None, "KEYWORD"), ("Keyword 2", "Lib", "KEYWORD"), ("Keyword 3", None, "TEARDOWN")]
+
+
+def random_times(rng):
+    return [rng.choice([rng.randint(0, 200), rng.randint(0, 100_000)]) for _ in range(rng.randint(0, 200))]
+
+
+def random_split(rng, items):
+    """Split items to random number of (possibly empty) shards."""
+    shards = [[] for _ in range(rng.randint(1, 6))]
+    for item in items:
+        rng.choice(shards).append(item)
+    return shards
+
+
+def random_fold(rng, partials, add):
+    """Add partials together in random order and random grouping."""
+    partials = list(partials)
+    rng.shuffle(partials)
+    while len(partials) > 1:
+        index = rng.randrange(len(partials) - 1)
+        partials[index : index + 2] = [add(partials[index], partials[index + 1])]
+    return partials[0]
+
+
+def timings_from(values):
+    timings = KeywordTimings()
+    for value in values:
+        timings.add_timing(value)
+    return timings
+
+
+def comparable(timings):
+    """Return dictionary of the timings where the floating point variance accumulators are compared approximately."""
+    data = timings.to_dict()
+    data["mean"], data["m2"] = pytest.approx(data["mean"], rel=1e-9), pytest.approx(data["m2"], rel=1e-9, abs=1e-6)
+    return data
+
+
+def random_calls(rng):
+    """Return list of executions - call path and elapsed time."""
+    executions = []
+    for _ in range(rng.randint(0, 60)):
+        path = tuple(rng.choice(KEYWORDS) for _ in range(rng.randint(1, 3)))
+        executions.append((path, rng.randint(0, 5000)))
+    return executions
+
+
+def calls_from(executions):
+    root = KeywordCalls()
+    for path, elapsed in executions:
+        calls = root
+        for key in path:
+            calls = calls.get_child(*key)
+        calls.used += 1
+        calls.timings.add_timing(elapsed)
+    return root
+
+
+def calls_to_dict(calls):
+    return {
+        "used": calls.used,
+        "timings": comparable(calls.timings),
+        "children": {key: calls_to_dict(child) for key, child in calls.children.items()},
+    }
+
+
+def merged_calls(first, second):
+    merged = KeywordCalls()
+    merged.merge(first)
+    merged.merge(second)
+    return merged
+
+
+class TestTimingsMerge:
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_merged_shards_equal_single_pass(self, seed):
+        rng = random.Random(seed)
+        times = random_times(rng)
+        shards = [timings_from(shard) for shard in random_split(rng, times)]
+        merged = random_fold(rng, shards, lambda first, second: first + second)
+        single_pass = timings_from(times)
+        assert comparable(merged) == comparable(single_pass)
+        assert merged.percentiles() == single_pass.percentiles()
+        assert (merged.min, merged.max, merged.avg) == (single_pass.min, single_pass.max, single_pass.avg)
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_in_place_merge_in_any_order(self, seed):
+        rng = random.Random(seed)
+        shards = [timings_from(shard) for shard in random_split(rng, random_times(rng))]
+        results = []
+        for _ in range(3):
+            rng.shuffle(shards)
+            timings = KeywordTimings()
+            for shard in shards:
+                timings.merge(shard)
+            results.append(timings.to_dict())
+        expected = comparable(timings)
+        assert all(result == expected for result in results)
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_empty_timings_are_identity(self, seed):
+        timings = timings_from(random_times(random.Random(seed)))
+        assert comparable(timings + KeywordTimings()) == comparable(timings)
+        assert comparable(KeywordTimings() + timings) == comparable(timings)
+        assert comparable(sum([timings])) == comparable(timings)
+
+    def test_adding_does_not_modify_operands(self):
+        first, second = timings_from([1, 2]), timings_from([300])
+        first + second
+        assert first.to_dict() == timings_from([1, 2]).to_dict()
+        assert second.to_dict() == timings_from([300]).to_dict()
+
+
+class TestKeywordCallsMerge:
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_merged_shards_equal_single_pass(self, seed):
+        rng = random.Random(seed)
+        executions = random_calls(rng)
+        shards = [calls_from(shard) for shard in random_split(rng, executions)]
+        merged = random_fold(rng, shards, merged_calls)
+        single_pass = calls_from(executions)
+        assert calls_to_dict(merged) == calls_to_dict(single_pass)
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_merge_does_not_modify_other_summary(self, seed):
+        rng = random.Random(seed)
+        first, second = calls_from(random_calls(rng)), calls_from(random_calls(rng))
+        expected = calls_to_dict(second)
+        first.merge(second)
+        first.merge(calls_from(random_calls(rng)))
+        assert calls_to_dict(second) == expected
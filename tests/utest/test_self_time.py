@@ -0,0 +1,91 @@
+import io
+
+import pytest
+import robot
+
+from sherlock.config import Config
+from sherlock.core import Sherlock
+from sherlock.exceptions import ConfigGeneralError
+from sherlock.report import get_reports
+
+SUITE = """
+*** Settings ***
+Resource    keywords.resource
+
+*** Test Cases ***
+Test
+    Wrapper
+"""
+
+RESOURCE = """
+*** Keywords ***
+Wrapper
+    FOR    ${index}    IN RANGE    2
+        Inner
+    END
+    IF    True
+        Inner
+    END
+    Sleep    0.05
+    [Teardown]    Inner
+
+Inner
+    Sleep    0.02
+"""
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    path = tmp_path_factory.mktemp("self_time")
+    (path / "suite.robot").write_text(SUITE)
+    (path / "keywords.resource").write_text(RESOURCE)
+    robot.run(str(path / "suite.robot"), output=str(path / "output.xml"), log=None, report=None, stdout=io.StringIO())
+    return path
+
+
+def get_timings(source, stream_output):
+    config = Config(from_cli=False)
+    config.path = source
+    config.root = source
+    config.output = [source / "output.xml"]
+    config.stream_output = stream_output
+    config.report = []
+    sherlock = Sherlock(config=config)
+    sherlock.run()
+    keywords = sherlock.resources[str((source / "keywords.resource").resolve())].keywords
+    return {kw_stat.name: kw_stat.timings for kw_stat in keywords}
+
+
+class TestSelfTime:
+    def test_self_time_excludes_called_keywords(self, source):
+        timings = get_timings(source, stream_output=False)
+        wrapper, inner = timings["Wrapper"], timings["Inner"]
+        assert inner.to_dict()["count"] == 4
+        # Sleep is a keyword too, so most of the time is spent in it and not in the user keywords
+        assert inner.total_ms >= 4 * 20
+        assert inner.self_total_ms <= inner.total_ms - 4 * 20
+        assert wrapper.total_ms >= inner.total_ms + 50
+        assert wrapper.self_total_ms <= wrapper.total_ms - inner.total_ms - 50
+
+    def test_streamed_output_gives_the_same_self_time(self, source):
+        from_model = {name: timings.to_dict() for name, timings in get_timings(source, stream_output=False).items()}
+        streamed = {name: timings.to_dict() for name, timings in get_timings(source, stream_output=True).items()}
+        assert streamed == from_model
+
+
+class TestSortBySelfTime:
+    def test_configure_print_report(self):
+        reports = get_reports(["print"], ["print:sort_by:self_time"])
+        assert reports["print"].sort_by == "self_time"
+
+    def test_invalid_sort_key(self):
+        with pytest.raises(ConfigGeneralError, match="Invalid value 'unknown' of print report 'sort_by' parameter"):
+            get_reports(["print"], ["print:sort_by:unknown"])
+
+    def test_unknown_parameter(self):
+        with pytest.raises(ConfigGeneralError, match="Report 'json' does not have 'sort_by' parameter"):
+            get_reports(["json"], ["json:sort_by:self_time"])
+
+    def test_invalid_format(self):
+        with pytest.raises(ConfigGeneralError, match="Expected format: report:param:value"):
+            get_reports(["print"], ["print:sort_by"])
@@ -0,0 +1,175 @@
+import contextlib
+import io
+import shutil
+import socketserver
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+import robot
+
+from sherlock.client import query
+from sherlock.config import Config
+from sherlock.core import Sherlock
+from sherlock.incremental import SNAPSHOTS_DIR
+from sherlock.server import SherlockServer
+
+pytestmark = pytest.mark.skipif(not hasattr(socketserver, "UnixStreamServer"), reason="Unix sockets are not supported")
+
+SUITE = """
+*** Settings ***
+Resource    keywords.resource
+Library     ServerLib.py
+
+*** Test Cases ***
+Test
+    Used Keyword
+    Used Keyword
+"""
+
+KEYWORDS = """
+*** Keywords ***
+Used Keyword
+    No Operation
+
+Not Used Keyword
+    No Operation
+"""
+
+
+@pytest.fixture
+def source(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "suite.robot").write_text(SUITE)
+    (source / "keywords.resource").write_text(KEYWORDS)
+    (source / "ServerLib.py").write_text("def old_kw():\n    pass\n")
+    return source
+
+
+def run_sherlock(source, cache_dir=None):
+    config = Config(from_cli=False)
+    config.path = source
+    config.root = source
+    config.cache_dir = cache_dir
+    config.report = []
+    sherlock = Sherlock(config=config)
+    sherlock.run()
+    return sherlock
+
+
+@contextlib.contextmanager
+def serving(sherlock):
+    with tempfile.TemporaryDirectory() as tmp_dir:  # Unix socket path length is limited, tmp_path can be too long
+        socket_path = Path(tmp_dir, "sherlock.sock")
+        server = SherlockServer(socket_path, sherlock)
+        thread = threading.Thread(target=server.serve)
+        thread.start()
+        yield socket_path
+        if not server.stopped:
+            query(socket_path, {"command": "shutdown"})
+        thread.join(timeout=10)
+        assert not socket_path.exists()
+
+
+@pytest.fixture
+def server(source):
+    with serving(run_sherlock(source)) as socket_path:
+        yield socket_path
+
+
+def run_robot(source, output):
+    robot.run(str(source), output=str(output), log=None, report=None, stdout=io.StringIO())
+    return output
+
+
+class TestServer:
+    def test_usage_of_keyword(self, server, source):
+        response = query(server, {"command": "usage", "keyword": "used keyword"})
+        assert response["status"] == "ok"
+        assert response["result"] == [
+            {
+                "name": "Used Keyword",
+                "source": str(source / "keywords.resource"),
+                "used": 2,
+                "timings": {
+                    "count": 0,
+                    "max": 0,
+                    "min": None,
+                    "total": 0,
+                    "self_total": 0,
+                    "histogram": [],
+                    "mean": 0.0,
+                    "m2": 0.0,
+                },
+            }
+        ]
+
+    def test_unused_keywords(self, server, source):
+        response = query(server, {"command": "unused", "file": str(source / "keywords.resource")})
+        assert response == {"status": "ok", "result": ["Not Used Keyword"]}
+
+    def test_analyze_output(self, server, source, tmp_path):
+        output = run_robot(source, tmp_path / "output.xml")
+        response = query(server, {"command": "analyze", "output": str(output)})
+        assert response["status"] == "ok"
+        assert response["result"]["errors"] == []
+        usage = query(server, {"command": "usage", "keyword": "Used Keyword"})["result"]
+        assert usage[0]["used"] == 2
+        assert usage[0]["timings"]["count"] == 2
+        # usage is replaced, not accumulated
+        query(server, {"command": "analyze", "output": str(output)})
+        assert query(server, {"command": "usage", "keyword": "Used Keyword"})["result"][0]["used"] == 2
+
+    def test_refresh(self, server, source):
+        (source / "keywords.resource").write_text(KEYWORDS + "\nNew Keyword\n    No Operation\n")
+        response = query(server, {"command": "refresh", "paths": [str(source / "keywords.resource")]})
+        assert response["status"] == "ok"
+        response = query(server, {"command": "unused", "file": str(source / "keywords.resource")})
+        assert sorted(response["result"]) == ["New Keyword", "Not Used Keyword"]
+
+    def test_refresh_changed_library(self, server, source):
+        library = source / "ServerLib.py"
+        library.write_text("def new_kw():\n    pass\n")
+        response = query(server, {"command": "refresh", "paths": [str(library)]})
+        assert response["status"] == "ok"
+        assert query(server, {"command": "usage", "keyword": "New Kw"})["result"][0]["name"] == "New Kw"
+
+    @pytest.mark.parametrize(
+        "request_data, message",
+        [
+            ({"command": "unknown"}, "Unknown command 'unknown'"),
+            ({"command": "usage"}, "Command 'usage' requires 'keyword' argument"),
+            ({"command": "unused", "file": "not_mapped.resource"}, "File 'not_mapped.resource' is not mapped"),
+            ({"command": "analyze", "output": "missing.xml"}, "No such file: 'missing.xml'"),
+        ],
+    )
+    def test_invalid_request(self, server, request_data, message):
+        response = query(server, request_data)
+        assert response["status"] == "error"
+        assert message in response["message"]
+        assert query(server, {"command": "usage", "keyword": "Used Keyword"})["status"] == "ok"
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_queries_do_not_store_snapshots(source, tmp_path):
+    subprocess.run(["git", "init", "-q"], cwd=source, check=True)
+    subprocess.run(["git", "add", "."], cwd=source, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init"],
+        cwd=source,
+        check=True,
+    )
+    snapshots = tmp_path / "cache" / SNAPSHOTS_DIR
+    sherlock = run_sherlock(source, cache_dir=tmp_path / "cache")
+    assert list(snapshots.iterdir())  # the startup analysis of the committed code is stored
+    shutil.rmtree(snapshots)
+    output = run_robot(source, tmp_path / "output.xml")
+    with serving(sherlock) as socket_path:
+        assert query(socket_path, {"command": "analyze", "output": str(output)})["status"] == "ok"
+        assert (
+            query(socket_path, {"command": "refresh", "paths": [str(source / "keywords.resource")]})["status"] == "ok"
+        )
+    assert not snapshots.exists()
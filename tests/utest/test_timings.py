@@ -0,0 +1,62 @@
+import statistics
+
+import pytest
+
+from sherlock.model import KeywordStats, KeywordTimings
+from sherlock.report.json import directory_to_json
+
+
+def timings_from(values):
+    timings = KeywordTimings()
+    for value in values:
+        timings.add_timing(value)
+    return timings
+
+
+class Resource:
+    def __init__(self, keywords):
+        self.name = "file.resource"
+        self.type = "Resource"
+        self.keywords = keywords
+
+
+class TestVariance:
+    def test_variance(self):
+        values = [100, 120, 80, 3000, 95]
+        timings = timings_from(values)
+        assert timings.variance == pytest.approx(statistics.pvariance(values))
+        assert timings.stddev_ms == pytest.approx(statistics.pstdev(values))
+        assert timings.coefficient_of_variation == pytest.approx(statistics.pstdev(values) / statistics.mean(values))
+
+    def test_numerically_stable_for_large_times(self):
+        values = [10**12 + offset for offset in (4, 7, 13, 16)]
+        assert timings_from(values).variance == pytest.approx(22.5)
+
+    def test_merged_variance(self):
+        first, second = [10, 20, 30], [1000, 1010]
+        merged = timings_from(first) + timings_from(second)
+        assert merged.variance == pytest.approx(statistics.pvariance(first + second))
+
+    def test_without_executions(self):
+        timings = KeywordTimings()
+        assert (timings.variance, timings.stddev_ms, timings.coefficient_of_variation) == (None, None, None)
+        assert timings.stddev == "0"
+        assert not timings.has_high_variance(0.5)
+
+    def test_constant_times(self):
+        timings = timings_from([0, 0])
+        assert timings.coefficient_of_variation is None
+        assert timings_from([5, 5, 5]).coefficient_of_variation == 0
+
+    @pytest.mark.parametrize("threshold, expected", [(None, False), (0.5, True), (2.0, False)])
+    def test_high_variance(self, threshold, expected):
+        assert timings_from([100, 120, 80, 3000, 95]).has_high_variance(threshold) is expected
+
+    def test_high_variance_in_json_report(self):
+        stable, unstable = KeywordStats("Stable", "file"), KeywordStats("Unstable", "file")
+        for elapsed in (100, 101, 99):
+            stable.timings.add_timing(elapsed)
+        for elapsed in (10, 2000, 15):
+            unstable.timings.add_timing(elapsed)
+        keywords = directory_to_json(Resource([stable, unstable]), variance_threshold=0.5)["keywords"]
+        assert [(kw["name"], kw["high_variance"]) for kw in keywords] == [("Stable", False), ("Unstable", True)]
@@ -0,0 +1,155 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from sherlock.file_utils import GitIgnore, PathFilter
+from sherlock.model import DIRECTORY_TYPE, Tree
+
+
+def create_files(root, files):
+    for file in files:
+        path = root / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("*** Keywords ***\nKeyword\n    No Operation\n" if path.suffix != ".py" else "")
+
+
+def tree_paths(tree):
+    paths = []
+    for child in tree.children:
+        if child.type == DIRECTORY_TYPE:
+            paths.extend(tree_paths(child))
+        else:
+            paths.append(str(child.path))
+    return paths
+
+
+def relative_paths(tree, root):
+    return sorted(os.path.relpath(path, root.resolve()) for path in tree_paths(tree))
+
+
+@pytest.fixture
+def scanned_directories():
+    scanned = []
+    original_scandir = os.scandir
+
+    def scandir(path):
+        scanned.append(os.path.basename(path))
+        return original_scandir(path)
+
+    with patch("sherlock.model.os.scandir", scandir):
+        yield scanned
+
+
+class TestTreeFromDirectory:
+    def test_resources_and_libraries(self, tmp_path):
+        create_files(
+            tmp_path,
+            ["suite.robot", "keywords.resource", "Library.py", "notes.txt", "package/__init__.py", "empty/readme.md"],
+        )
+        tree = Tree.from_directory(tmp_path)
+        assert relative_paths(tree, tmp_path) == ["Library.py", "keywords.resource", "package", "suite.robot"]
+
+    def test_package_with_resources(self, tmp_path):
+        create_files(tmp_path, ["package/__init__.py", "package/module.py", "package/keywords.resource"])
+        tree = Tree.from_directory(tmp_path)
+        (package,) = tree.children
+        assert package.type == DIRECTORY_TYPE
+        assert package.children[-1].path == (tmp_path / "package").resolve()
+        assert relative_paths(tree, tmp_path) == ["package", "package/keywords.resource", "package/module.py"]
+
+    def test_every_directory_is_read_once(self, tmp_path, scanned_directories):
+        create_files(tmp_path, ["a/__init__.py", "a/b/keywords.resource", "c/suite.robot"])
+        Tree.from_directory(tmp_path)
+        assert sorted(scanned_directories) == sorted([tmp_path.name, "a", "b", "c"])
+
+    def test_ignored_directory_is_not_read(self, tmp_path, scanned_directories):
+        create_files(tmp_path, ["src/suite.robot", "venv/lib/Library.py", "ignored.robot"])
+        (tmp_path / ".gitignore").write_text("venv/\nignored.robot\n")
+        tree = Tree.from_directory(tmp_path)
+        assert relative_paths(tree, tmp_path) == ["src/suite.robot"]
+        assert "venv" not in scanned_directories
+        assert "lib" not in scanned_directories
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="Symbolic links are not supported")
+    def test_symlinked_directory_is_resolved(self, tmp_path):
+        create_files(tmp_path, ["shared/keywords.resource"])
+        (tmp_path / "src").mkdir()
+        try:
+            os.symlink(tmp_path / "shared", tmp_path / "src" / "linked", target_is_directory=True)
+        except OSError:
+            pytest.skip("Creating symbolic links is not permitted")
+        tree = Tree.from_directory(tmp_path / "src")
+        assert tree_paths(tree) == [str((tmp_path / "shared" / "keywords.resource").resolve())]
+
+    def test_excluded_directory_is_not_read(self, tmp_path, scanned_directories):
+        create_files(tmp_path, ["src/suite.robot", "src/generated/data.robot", "node_modules/lib/Library.py"])
+        path_filter = PathFilter.from_patterns(["node_modules/", "**/generated"], [])
+        tree = Tree.from_directory(tmp_path, path_filter=path_filter)
+        assert relative_paths(tree, tmp_path) == ["src/suite.robot"]
+        assert "node_modules" not in scanned_directories
+        assert "generated" not in scanned_directories
+
+    def test_exclude_is_relative_to_source(self, tmp_path):
+        create_files(tmp_path, ["src/suite.robot", "src/src/suite.robot"])
+        path_filter = PathFilter.from_patterns(["/src/src/"], [])
+        tree = Tree.from_directory(tmp_path, path_filter=path_filter)
+        assert relative_paths(tree, tmp_path) == ["src/suite.robot"]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_include(self, tmp_path, jobs):
+        create_files(tmp_path, ["suite.robot", "keywords.resource", "Library.py", "package/__init__.py", "a/b.robot"])
+        path_filter = PathFilter.from_patterns([], ["*.robot"])
+        tree = Tree.from_directory(tmp_path, jobs=jobs, path_filter=path_filter)
+        assert relative_paths(tree, tmp_path) == ["a/b.robot", "suite.robot"]
+
+    def test_nested_gitignore(self, tmp_path, scanned_directories):
+        create_files(
+            tmp_path,
+            [
+                "suite.robot",
+                "build/out.robot",
+                "pkg/keywords.resource",
+                "pkg/data/generated.robot",
+                "pkg/build/kept.robot",
+                "other/data/kept.robot",
+            ],
+        )
+        (tmp_path / ".gitignore").write_text("build/\n")
+        (tmp_path / "pkg" / ".gitignore").write_text("/data/\n!build/\n")
+        tree = Tree.from_directory(tmp_path, gitignore=GitIgnore.for_directory(tmp_path, tmp_path))
+        assert relative_paths(tree, tmp_path) == [
+            "other/data/kept.robot",
+            "pkg/build/kept.robot",
+            "pkg/keywords.resource",
+            "suite.robot",
+        ]
+        assert scanned_directories.count("data") == 1  # only other/data, pkg/data is pruned
+
+    def test_gitignore_of_parent_directory(self, tmp_path):
+        create_files(tmp_path, ["src/tests/suite.robot", "src/tests/results/output.robot", "results/kept.robot"])
+        (tmp_path / ".gitignore").write_text("src/tests/results/\n")
+        (tmp_path / "src" / ".gitignore").write_text("*.resource\n")
+        source = tmp_path / "src" / "tests"
+        create_files(source, ["keywords.resource"])
+        tree = Tree.from_directory(source, gitignore=GitIgnore.for_directory(source, tmp_path))
+        assert relative_paths(tree, source) == ["suite.robot"]
+
+
+class TestLowMemory:
+    RESOURCE = (
+        "*** Variables ***\n${SCALAR}    value\n@{LIST}    a    b\n\n"
+        "*** Keywords ***\nKeyword\n    IF    $cond\n        Log    ${SCALAR}\n    END\n"
+    )
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_resources_keep_only_compact_data(self, tmp_path, jobs):
+        (tmp_path / "keywords.resource").write_text(self.RESOURCE)
+        full = Tree.from_directory(tmp_path).children[0]
+        compact = Tree.from_directory(tmp_path, jobs=jobs, low_memory=True).children[0]
+        (kw_stat,) = compact.keywords
+        assert not any(hasattr(kw, "node") for kw in (*full.keywords, kw_stat))  # parsed models are never kept
+        assert (kw_stat.complexity, kw_stat.length, kw_stat.nesting_depth) == (2, 4, 1)
+        assert compact.variables.as_dict() == full.variables.as_dict()
+        assert compact.variables["@{LIST}"] == ["a", "b"]
+        assert compact.to_data().to_dict() == full.to_data().to_dict()
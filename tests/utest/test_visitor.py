@@ -0,0 +1,61 @@
+import pytest
+from robot.conf import RobotSettings
+
+from sherlock.model import Resource
+from sherlock.visitor import StructureVisitor
+
+
+@pytest.fixture
+def suites(tmp_path):
+    (tmp_path / "a.resource").write_text("*** Keywords ***\nKeyword\n    No Operation\n")
+    (tmp_path / "b.resource").write_text("*** Keywords ***\nKeyword\n    No Operation\n")
+    for name, resource in (("suite1", "a"), ("suite2", "a"), ("suite3", "b")):
+        (tmp_path / f"{name}.robot").write_text(
+            f"*** Settings ***\nResource    {resource}.resource\n\n*** Test Cases ***\nTest\n    Keyword\n"
+        )
+    resources = {str(path): Resource(path) for path in sorted(tmp_path.iterdir())}
+    return tmp_path, StructureVisitor(resources, from_output=True, robot_settings=RobotSettings())
+
+
+class TestSearchCache:
+    def test_search_is_cached(self, suites):
+        path, visitor = suites
+        visitor.set_suite_context(path / "suite1.robot")
+        found = visitor.search_def("Keyword", None)
+        assert found[0].parent == str(path / "a.resource")
+        assert visitor.search_def("keyword", None) is found
+
+    def test_cache_invalidated_when_imports_change(self, suites):
+        path, visitor = suites
+        visitor.set_suite_context(path / "suite1.robot")
+        visitor.search_def("Keyword", None)
+        visitor.set_suite_context(path / "suite3.robot")
+        assert not visitor.search_cache
+        assert visitor.search_def("Keyword", None)[0].parent == str(path / "b.resource")
+
+    def test_cache_invalidated_when_context_restored(self, suites):
+        path, visitor = suites
+        visitor.set_suite_context(path / "suite1.robot")
+        context = visitor.get_suite_context()
+        visitor.set_suite_context(path / "suite3.robot")
+        visitor.search_def("Keyword", None)
+        visitor.restore_suite_context(context)
+        assert visitor.search_def("Keyword", None)[0].parent == str(path / "a.resource")
+
+
+class TestImportClosures:
+    def test_suites_with_the_same_imports_share_closure(self, suites):
+        path, visitor = suites
+        visitor.set_suite_context(path / "suite1.robot")
+        imported = visitor.imported_resources
+        visitor.set_suite_context(path / "suite2.robot")
+        assert visitor.imported_resources is imported
+        assert list(imported) == [str(path / "a.resource")]
+        assert len(visitor.import_closures) == 1
+
+    def test_suites_with_different_imports(self, suites):
+        path, visitor = suites
+        visitor.set_suite_context(path / "suite1.robot")
+        visitor.set_suite_context(path / "suite3.robot")
+        assert list(visitor.imported_resources) == [str(path / "b.resource")]
+        assert len(visitor.import_closures) == 2
@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+
+import pytest
+
+from sherlock.config import Config
+from sherlock.core import Sherlock
+from sherlock.watch import InotifyWatcher, PollingWatcher, filter_relevant
+
+SUITE = """
+*** Settings ***
+Resource    keywords.resource
+Resource    other.resource
+Library     MyLibrary.py
+
+*** Test Cases ***
+Test
+    First Keyword
+    Library Keyword
+"""
+
+KEYWORDS = """
+*** Keywords ***
+First Keyword
+    Other Keyword
+"""
+
+OTHER = """
+*** Keywords ***
+Other Keyword
+    No Operation
+"""
+
+LIBRARY = """
+def library_keyword():
+    pass
+"""
+
+
+@pytest.fixture
+def source(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    for name, content in (
+        ("suite.robot", SUITE),
+        ("keywords.resource", KEYWORDS),
+        ("other.resource", OTHER),
+        ("MyLibrary.py", LIBRARY),
+    ):
+        (source / name).write_text(content)
+    return source
+
+
+def wait_for_changes(watcher, timeout=5):
+    deadline = time.monotonic() + timeout
+    changed = set()
+    while time.monotonic() < deadline:
+        changed |= watcher.wait(0.2)
+        if changed:
+            changed |= watcher.wait(0.2)
+            return changed
+    return changed
+
+
+def touch(path, content):
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))  # coarse mtime resolution
+
+
+class TestWatchers:
+    def test_polling_watcher(self, source):
+        watcher = PollingWatcher([str(source)], interval=0.05)
+        touch(source / "keywords.resource", KEYWORDS + "\n")
+        (source / "new.robot").write_text(SUITE)
+        (source / "other.resource").unlink()
+        assert wait_for_changes(watcher) == {
+            str(source / "keywords.resource"),
+            str(source / "new.robot"),
+            str(source / "other.resource"),
+        }
+        assert watcher.wait(0.1) == set()
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+    def test_inotify_watcher(self, source):
+        watcher = InotifyWatcher([str(source)])
+        try:
+            (source / "keywords.resource").write_text(KEYWORDS + "\n")
+            assert str(source / "keywords.resource") in wait_for_changes(watcher)
+            (source / "nested").mkdir()
+            assert str(source / "nested") in wait_for_changes(watcher)
+            (source / "nested" / "new.resource").write_text(OTHER)
+            assert str(source / "nested" / "new.resource") in wait_for_changes(watcher)
+        finally:
+            watcher.close()
+
+    def test_filter_relevant(self, source):
+        config = Config(from_cli=False)
+        changed = {
+            str(source / "suite.robot"),
+            str(source / "notes.txt"),
+            str(source / "nested"),
+            str(source / "package" / "__init__.py"),
+        }
+        assert filter_relevant(changed, config) == {
+            str(source / "suite.robot"),
+            str(source / "nested"),
+            str(source / "package"),
+            str(source / "package" / "__init__.py"),
+        }
+
+
+class TestRefresh:
+    def test_only_changed_files_are_parsed_again(self, source):
+        config = Config(from_cli=False)
+        config.path = source
+        config.report = []
+        sherlock = Sherlock(config=config)
+        sherlock.run()
+        keywords_path, other_path = str(source / "keywords.resource"), str(source / "other.resource")
+        library_path = str(source / "MyLibrary.py")
+        other, library = sherlock.resources[other_path], sherlock.resources[library_path]
+        assert other.keywords.get("Other Keyword").used == 0  # used only from not executed keyword
+        assert library.keywords.get("Library Keyword").used == 1
+
+        (source / "keywords.resource").write_text(KEYWORDS + "\nSecond Keyword\n    No Operation\n")
+        (source / "suite.robot").write_text(SUITE + "    Second Keyword\n    Library Keyword\n")
+        sherlock.refresh({keywords_path, str(source / "suite.robot")})
+
+        assert sherlock.resources[other_path] is other
+        assert sherlock.resources[library_path] is library
+        assert sherlock.resources[keywords_path].keywords.get("Second Keyword").used == 1
+        assert library.keywords.get("Library Keyword").used == 2
+        assert sherlock.keyword_index.get_definitions("Second Keyword")
+        assert len(sherlock.keyword_index.get_definitions("First Keyword")) == 1
+
+    def test_removed_file(self, source):
+        config = Config(from_cli=False)
+        config.path = source
+        config.report = []
+        sherlock = Sherlock(config=config)
+        sherlock.run()
+        (source / "other.resource").unlink()
+        sherlock.refresh({str(source / "other.resource")})
+        assert str(source / "other.resource") not in sherlock.resources
+        assert not sherlock.keyword_index.get_definitions("Other Keyword")